@@ -0,0 +1,47 @@
+"""Add match participants table
+
+Revision ID: 3c8f1d2a9b47
+Revises: 627d723f8d40
+Create Date: 2026-10-17 09:12:41.208815
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c8f1d2a9b47'
+down_revision: Union[str, None] = '627d723f8d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('match_participants',
+    sa.Column('match_id', sa.String(), nullable=False),
+    sa.Column('profile_id', sa.String(), nullable=False),
+    sa.Column('team', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['match_id'], ['matches.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('match_id', 'profile_id')
+    )
+    op.create_index('ix_match_participants_profile_id_created_at', 'match_participants', ['profile_id', 'created_at', 'match_id'], unique=False)
+
+    # Backfill from the teams JSON of existing matches, [{"<profile id>": <team>}, ...]
+    op.execute("""
+        INSERT INTO match_participants (match_id, profile_id, team, created_at)
+        SELECT m.id, player.key, player.value::integer, m.created_at
+        FROM matches m
+        CROSS JOIN LATERAL jsonb_array_elements(m.teams) AS entry(value)
+        CROSS JOIN LATERAL jsonb_each_text(entry.value) AS player(key, value)
+        WHERE jsonb_typeof(m.teams) = 'array'
+          AND jsonb_typeof(entry.value) = 'object'
+        ON CONFLICT (match_id, profile_id) DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_match_participants_profile_id_created_at', table_name='match_participants')
+    op.drop_table('match_participants')
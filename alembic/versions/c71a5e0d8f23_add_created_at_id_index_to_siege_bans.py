@@ -0,0 +1,35 @@
+"""Add created_at, id index to siege bans
+
+Revision ID: c71a5e0d8f23
+Revises: 3c8f1d2a9b47
+Create Date: 2026-10-17 11:26:52.913604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71a5e0d8f23'
+down_revision: Union[str, None] = '3c8f1d2a9b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves the keyset pagination of /bans, built concurrently so ban ingest isn't blocked
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_siege_bans_created_at_id',
+            'siege_bans',
+            ['created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_siege_bans_created_at_id', table_name='siege_bans', postgresql_concurrently=True)
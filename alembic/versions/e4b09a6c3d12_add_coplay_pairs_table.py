@@ -0,0 +1,45 @@
+"""Add coplay pairs table
+
+Revision ID: e4b09a6c3d12
+Revises: c71a5e0d8f23
+Create Date: 2026-10-17 12:40:09.335761
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b09a6c3d12'
+down_revision: Union[str, None] = 'c71a5e0d8f23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('coplay_pairs',
+    sa.Column('player_a', sa.String(), nullable=False),
+    sa.Column('player_b', sa.String(), nullable=False),
+    sa.Column('team', sa.Integer(), nullable=False),
+    sa.Column('matches_together', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('player_a', 'player_b', 'team')
+    )
+
+    # Backfill from match_participants, every two players on the same team of a match. Pairs are
+    # ordered by code point like Python's sorted() at ingest, not by the database collation
+    op.execute("""
+        INSERT INTO coplay_pairs (player_a, player_b, team, matches_together)
+        SELECT a.profile_id, b.profile_id, a.team, count(*)
+        FROM match_participants a
+        JOIN match_participants b
+          ON b.match_id = a.match_id
+         AND b.team = a.team
+         AND b.profile_id COLLATE "C" > a.profile_id COLLATE "C"
+        GROUP BY a.profile_id, b.profile_id, a.team
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('coplay_pairs')
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, ARRAY, DateTime
+from sqlalchemy import Column, String, Integer, Boolean, ForeignKey, ARRAY, DateTime, Index
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -36,6 +36,43 @@ class Match(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     created_by_host = Column(String)
 
+    participants = relationship('MatchParticipant', back_populates='match', cascade="all, delete-orphan")
+
+
+class MatchParticipant(Base):
+    """
+    One row per player of a match, the normalized form of Match.teams written at ingest.
+    Lets player match lookups use an index instead of scanning every match's teams.
+    """
+    __tablename__ = "match_participants"
+
+    match_id = Column(String, ForeignKey('matches.id', ondelete='CASCADE'), primary_key=True)
+    profile_id = Column(String, primary_key=True)
+    team = Column(Integer, nullable=False)
+    # Copy of Match.created_at, so a player's matches can be listed newest first from the index alone.
+    # Written in the same transaction as the match, so now() gives both the same timestamp
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    match = relationship('Match', back_populates='participants')
+
+    __table_args__ = (
+        Index('ix_match_participants_profile_id_created_at', 'profile_id', 'created_at', 'match_id'),
+    )
+
+
+class CoplayPair(Base):
+    """
+    How many matches two players played on the same team, counted per team number and kept up
+    to date at ingest. player_a is always the smaller profile id of the two, by code point
+    (Python's str ordering, COLLATE "C" in SQL) so it doesn't depend on the database collation.
+    """
+    __tablename__ = "coplay_pairs"
+
+    player_a = Column(String, primary_key=True)
+    player_b = Column(String, primary_key=True)
+    team = Column(Integer, primary_key=True)
+    matches_together = Column(Integer, nullable=False, default=0)
+
 
 class SiegeBan(Base):
     __tablename__ = "siege_bans"
@@ -52,6 +89,11 @@ class SiegeBan(Base):
 
     ban_metadata = relationship('SiegeBanMetadata', back_populates='siegeban', cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Keyset pagination of /bans, newest first
+        Index('ix_siege_bans_created_at_id', 'created_at', 'id'),
+    )
+
 class SiegeBanMetadata(Base):
     __tablename__ = "siege_bans_metadata"
 
@@ -0,0 +1,50 @@
+from datetime import datetime
+from sqlalchemy import and_, or_, text, tuple_
+from sqlalchemy.orm import Session
+from typing import Optional, Tuple
+import base64
+import binascii
+import orjson
+
+Cursor = Tuple[Optional[datetime], str]
+
+def encode_cursor(created_at: Optional[datetime], row_id: str) -> str:
+    """
+    Opaque token pointing right after a row, in (created_at, id) descending order.
+    """
+    payload = orjson.dumps([created_at.isoformat() if created_at else None, row_id])
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Cursor:
+    """
+    :raises ValueError: the token was not made by encode_cursor
+    """
+    try:
+        created_at, row_id = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return (datetime.fromisoformat(created_at) if created_at else None), str(row_id)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def seek_after(created_at_column, id_column, cursor: Cursor):
+    """
+    Filter for the rows after the cursor in ORDER BY created_at DESC, id DESC.
+
+    Compares (created_at, id) as a row value, so it seeks through a (created_at, id) index
+    instead of skipping rows like OFFSET does. Postgres sorts NULL created_at first in
+    descending order, those rows come before every dated one.
+    """
+    created_at, row_id = cursor
+    if created_at is None:
+        return or_(and_(created_at_column.is_(None), id_column < row_id), created_at_column.isnot(None))
+    return tuple_(created_at_column, id_column) < tuple_(created_at, row_id)
+
+def estimate_count(session: Session, table_name: str) -> int:
+    """
+    Row count of a table from the planner statistics, instead of a full count(*).
+    Only as fresh as the last (auto)vacuum / analyze of the table.
+    """
+    estimate = session.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table_name"),
+        {"table_name": table_name}
+    ).scalar()
+    return max(int(estimate or 0), 0)
@@ -40,9 +40,10 @@ async def lifespan(app: FastAPI):
     try:
         yield
     finally:
-        task.cancel()
-        with contextlib.suppress(asyncio.CancelledError):
-            await task
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
 
         # Clean up ubisoft_handler
         await app.state.ubisoft_handler.close()
@@ -1,10 +1,12 @@
 from database.handler import SessionLocal
-from database.models import Match
+from database.models import Match, MatchParticipant, CoplayPair
 from fastapi import APIRouter, Request, HTTPException
 from pydantic import BaseModel
 from typing import List, Dict
 from datetime import datetime, timedelta
 from sqlalchemy import and_
+from sqlalchemy.dialects.postgresql import insert
+from itertools import combinations
 import hashlib
 import json
 import logging
@@ -57,6 +59,28 @@ def generate_match_signature(identifiers: List[Dict[str, int]], time_window_hour
 
     return signature_hash
 
+def count_coplay_pairs(db, teams: Dict[str, int]) -> None:
+    """
+    Add one match to the coplay_pairs counts of every two players on the same team, in the caller's transaction.
+
+    Args:
+        db: Database session
+        teams: team of every player in the match, keyed by profile id
+    """
+    pairs = [
+        {"player_a": player_a, "player_b": player_b, "team": teams[player_a], "matches_together": 1}
+        for player_a, player_b in combinations(sorted(teams), 2)
+        if teams[player_a] == teams[player_b]
+    ]
+    if not pairs:
+        return
+
+    statement = insert(CoplayPair).values(pairs)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[CoplayPair.player_a, CoplayPair.player_b, CoplayPair.team],
+        set_={"matches_together": CoplayPair.matches_together + 1}
+    ))
+
 @router.post("/ingest/match")
 async def ingest_match(request: Request, match: IngestMatchModel):
     """
@@ -105,13 +129,17 @@ async def ingest_match(request: Request, match: IngestMatchModel):
             }
 
         # No existing match found, create new one
+        teams = {profile_id: team for player_dict in match.identifiers for profile_id, team in player_dict.items()}
         new_match = Match(
             teams=match.identifiers,
             created_by_host=request.client.host,
-            signature=match_signature
+            signature=match_signature,
+            # Indexed by player for the match lookups, inserted in the same transaction
+            participants=[MatchParticipant(profile_id=profile_id, team=team) for profile_id, team in teams.items()]
         )
 
         db.add(new_match)
+        count_coplay_pairs(db, teams)
         db.commit()
         db.refresh(new_match)
 
@@ -1,14 +1,17 @@
 from collections import defaultdict
 from database.handler import get_db
-from database.models import SiegeBan, SiegeBanMetadata, Match
-from fastapi import HTTPException, Depends, Request, APIRouter
+from database.pagination import decode_cursor, encode_cursor, estimate_count, seek_after
+from database.models import SiegeBan, SiegeBanMetadata, Match, MatchParticipant, CoplayPair
+from fastapi import HTTPException, Depends, Request, Response, APIRouter
 from itertools import combinations
 from pydantic import BaseModel, Field
 from services.user.token import get_current_user
 from services.webhook_exception_handler import WebhookExceptionHandler
+from sqlalchemy import func, tuple_
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from wrapper.models import Player
+import asyncio
 import logging
 import math
 
@@ -21,9 +24,10 @@ async def lookup_profile_id(request: Request, uplay: str, current_user = Depends
     try:
         ubisoft_handler = request.app.state.ubisoft_handler
 
-        player: Player = await ubisoft_handler.lookup_via_uplay(uplay)
+        # Resolving the name is a cache read once it was looked up, then the formatted player is too
+        profile_id = await ubisoft_handler.convert_uplay_to_profile_id(uplay)
 
-        return ubisoft_handler.format_player(player)
+        return Response(content=await ubisoft_handler.lookup_formatted_player(profile_id), media_type="application/json")
     except Exception as e:
         e_str = f"Exception: {str(e)}\n\nRequest data: {request.url}\nMethod: {request.method}\nHeaders: {dict(request.headers)}\nClient: {request.client}"
         logger.error(f"Error [Uplay Lookup: {e_str}")
@@ -78,9 +82,8 @@ async def lookup_profile_id(request: Request, profile_id: str, current_user = De
     try:
         ubisoft_handler = request.app.state.ubisoft_handler
 
-        player: Player = await ubisoft_handler.lookup_via_profile_id(profile_id)
-
-        return ubisoft_handler.format_player(player)
+        # Already encoded JSON, usually straight from the response cache
+        return Response(content=await ubisoft_handler.lookup_formatted_player(profile_id), media_type="application/json")
     except Exception as e:
         e_str = f"Exception: {str(e)}\n\nRequest data: {request.url}\nMethod: {request.method}\nHeaders: {dict(request.headers)}\nClient: {request.client}"
         logger.error(f"Error [Profile ID Lookup]: {e_str}")
@@ -157,13 +160,23 @@ async def lookup_match_players(
             raise HTTPException(status_code=404, detail="No match found for the provided match ID!")
 
         ubisoft_handler = request.app.state.ubisoft_handler
-        players = []
-        for item in match.teams:
-            for key, value in item.items():
-                player: Player = await ubisoft_handler.lookup_via_profile_id(key)
-                data_to_add = ubisoft_handler.format_player(player)
-                data_to_add["team"] = value
-                players.append(data_to_add)
+        teams = [(key, value) for item in match.teams for key, value in item.items()]
+
+        # Fetch the whole lobby at once so the list based endpoints are shared between players
+        found: Dict[str, Player] = await ubisoft_handler.lookup_via_profile_ids([key for key, _ in teams])
+
+        async def get_team_player(key: str) -> Player:
+            player = found.get(key)
+            if player is None:
+                player = await ubisoft_handler.lookup_via_profile_id(key)
+            return player
+
+        lobby = await asyncio.gather(*(get_team_player(key) for key, _ in teams))
+
+        # Formatting the lobby together shares one twitch request between every streamer in it
+        players = await ubisoft_handler.format_players(list(lobby))
+        for data_to_add, (_, value) in zip(players, teams):
+            data_to_add["team"] = value
         return players
     except Exception as e:
         e_str = f"Exception: {str(e)}\n\nRequest data: {request.url}\nMethod: {request.method}\nHeaders: {dict(request.headers)}\nClient: {request.client}"
@@ -237,27 +250,21 @@ def find_frequent_groups(session: Session, team_players: List[str], team_number:
     if len(team_players) < 2:
         return []
 
-    # Get all matches from database
-    all_matches = session.query(Match).all()
-
-    # Build a graph of player connections
+    # Build a graph of player connections from the pair counts kept at ingest, only the pairs of this team are read
     player_connections = defaultdict(lambda: defaultdict(int))
 
-    for match in all_matches:
-        match_teams = match.teams
-        match_players_on_team = set()
-
-        # Extract players on the same team number from this match
-        for player_dict in match_teams:
-            for player_id, team in player_dict.items():
-                if team == team_number and player_id in team_players:
-                    match_players_on_team.add(player_id)
+    # Pairs are keyed in code point order, the same sorted() order count_coplay_pairs writes them in
+    pairs = (
+        session.query(CoplayPair.player_a, CoplayPair.player_b, CoplayPair.matches_together)
+        .filter(tuple_(CoplayPair.player_a, CoplayPair.player_b, CoplayPair.team).in_([
+            (p1, p2, team_number) for p1, p2 in combinations(sorted(set(team_players)), 2)
+        ]))
+        .all()
+    )
 
-        # Count connections between all pairs of players in this match
-        if len(match_players_on_team) >= 2:
-            for p1, p2 in combinations(sorted(match_players_on_team), 2):
-                player_connections[p1][p2] += 1
-                player_connections[p2][p1] += 1
+    for p1, p2, matches_together in pairs:
+        player_connections[p1][p2] = matches_together
+        player_connections[p2][p1] = matches_together
 
     # Find connected components using Union-Find
     parent = {}
@@ -343,135 +350,120 @@ async def lookup_match_players(
 class PlayerMatchesLookupModel(BaseModel):
     """Request model for player matches lookup with pagination."""
     profile_id: str = Field(..., description="The player's profile ID")
-    page: int = Field(default=1, ge=1, description="Page number (1-indexed)")
+    page: int = Field(default=1, ge=1, description="Page number (1-indexed), ignored when a cursor is given")
     page_size: int = Field(default=10, ge=1, le=100, description="Number of matches per page")
+    cursor: Optional[str] = Field(default=None, description="next_cursor of the previous page, pages deep histories at a constant cost")
+    include_summary: bool = Field(default=True, description="Whether to count the summary statistics and the total")
 
 
-def get_player_matches_with_summary(session: Session, profile_id: str, page: int = 1, page_size: int = 10) -> Dict[str, Any]:
+def get_player_matches_with_summary(
+        session: Session,
+        profile_id: str,
+        page: int = 1,
+        page_size: int = 10,
+        cursor: Optional[str] = None,
+        include_summary: bool = True
+) -> Dict[str, Any]:
     """
-    Retrieve all matches for a specific player with pagination and summary statistics.
+    Retrieve a page of a player's matches, newest first, with summary statistics.
+
+    Pages are read straight from the (profile_id, created_at, match_id) index of match_participants.
+    With a cursor the page seeks to the previous page's last match, so every page costs the same.
+    Page numbers still work but skip rows with OFFSET.
 
     Args:
         session: Database session
         profile_id: The player's profile ID to search for
-        page: Page number (1-indexed)
+        page: Page number (1-indexed), only used without a cursor
         page_size: Number of matches per page
+        cursor: next_cursor of the previous page
+        include_summary: Whether to count the summary statistics and the total
 
     Returns:
         Dictionary containing paginated match data, summary statistics, and metadata
     """
     try:
-        # For PostgreSQL JSONB, we can use containment operators or filter in Python
-        # Get all matches where teams is not null
-        all_matches = (
-            session.query(Match)
-            .filter(Match.teams.isnot(None))
-            .order_by(Match.created_at.desc()) 
-            .all()
+        query = (
+            session.query(Match, MatchParticipant.team, MatchParticipant.created_at)
+            .join(MatchParticipant, MatchParticipant.match_id == Match.id)
+            .filter(MatchParticipant.profile_id == profile_id)
+            .order_by(MatchParticipant.created_at.desc(), MatchParticipant.match_id.desc())
         )
-        matching_matches = []
-
-        for match in all_matches:
-            teams_data = match.teams
-            player_found = False
-
-            # Search through the teams structure to find the profile_id
-            if teams_data and isinstance(teams_data, list):
-                for player_dict in teams_data:
-                    if isinstance(player_dict, dict) and profile_id in player_dict:
-                        player_found = True
-                        break
-
-            if player_found:
-                matching_matches.append(match)
-
-        # Calculate pagination values
-        total_matches = len(matching_matches)
-        total_pages = math.ceil(total_matches / page_size) if total_matches > 0 else 1
-        offset = (page - 1) * page_size
-
-        # Validate page number
-        if page > total_pages and total_matches > 0:
-            return {
-                "error": f"Page {page} does not exist. Total pages: {total_pages}"
-            }
+        if cursor:
+            try:
+                query = query.filter(seek_after(MatchParticipant.created_at, MatchParticipant.match_id, decode_cursor(cursor)))
+            except ValueError as e:
+                return {"error": str(e)}
+        elif page > 1:
+            query = query.offset((page - 1) * page_size)
+
+        # One extra row tells whether there is a next page without counting
+        rows = query.limit(page_size + 1).all()
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+
+        summary = None
+        total_matches = None
+        total_pages = None
+        if include_summary:
+            # Counted by Postgres from the match_participants index, one row per team comes back
+            team_counts = dict(
+                session.query(MatchParticipant.team, func.count())
+                .filter(MatchParticipant.profile_id == profile_id)
+                .group_by(MatchParticipant.team)
+                .all()
+            )
+            team_0_count = team_counts.get(0, 0)
+            team_1_count = team_counts.get(1, 0)
+            total_matches = sum(team_counts.values())
 
-        # Get the paginated slice
-        paginated_matches = matching_matches[offset:offset + page_size]
-
-        # Process all matches to calculate summary statistics and format data
-        all_matches_data = []
-        team_0_count = 0
-        team_1_count = 0
-        wins = 0
-        losses = 0
-
-        for match in matching_matches:
-            # Determine which team the player was on
-            player_team = None
-            teams_data = match.teams
-
-            if teams_data and isinstance(teams_data, list):
-                for player_dict in teams_data:
-                    if isinstance(player_dict, dict) and profile_id in player_dict:
-                        player_team = player_dict[profile_id]
-                        break
-
-            # Count team distribution
-            if player_team == 0:
-                team_0_count += 1
-            elif player_team == 1:
-                team_1_count += 1
-
-            # Count wins and losses
-            if hasattr(match, 'winner') and match.winner is not None:
-                if match.winner == player_team:
-                    wins += 1
-                else:
-                    losses += 1
-
-            match_data = {
-                "match_id": match.id,
-                "player_team": player_team,
-                "created_at": match.created_at.isoformat() if hasattr(match, 'created_at') and match.created_at else None,
-                "teams": teams_data
-            }
+            # Matches don't record a winner yet, so there is nothing to count wins and losses from
+            wins = 0
+            losses = 0
+
+            total_pages = math.ceil(total_matches / page_size) if total_matches > 0 else 1
 
-            # Add any other relevant match fields
-            if hasattr(match, 'status'):
-                match_data["status"] = match.status
-            if hasattr(match, 'duration'):
-                match_data["duration"] = match.duration
-            if hasattr(match, 'winner'):
-                match_data["winner"] = match.winner
+            # Calculate win rate
+            win_rate = (wins / (wins + losses)) * 100 if (wins + losses) > 0 else 0.0
 
-            all_matches_data.append(match_data)
+            summary = {
+                "total_matches": total_matches,
+                "team_0_matches": team_0_count,
+                "team_1_matches": team_1_count,
+                "wins": wins,
+                "losses": losses,
+                "win_rate": round(win_rate, 2)
+            }
 
-        # Get paginated slice for current page
-        paginated_matches = all_matches_data[offset:offset + page_size]
+            # Validate page number
+            if not cursor and page > total_pages and total_matches > 0:
+                return {
+                    "error": f"Page {page} does not exist. Total pages: {total_pages}"
+                }
 
-        # Calculate win rate
-        win_rate = (wins / (wins + losses)) * 100 if (wins + losses) > 0 else 0.0
+        paginated_matches = [
+            {
+                "match_id": match.id,
+                "player_team": player_team,
+                "created_at": match.created_at.isoformat() if match.created_at else None,
+                "teams": match.teams
+            }
+            for match, player_team, _ in rows
+        ]
 
         return {
             "profile_id": profile_id,
             "matches": paginated_matches,
             "pagination": {
-                "current_page": page,
+                "current_page": None if cursor else page,
                 "page_size": page_size,
                 "total_matches": total_matches,
                 "total_pages": total_pages,
-                "has_next": page < total_pages,
-                "has_previous": page > 1
+                "has_next": has_next,
+                "has_previous": bool(cursor) or page > 1,
+                "next_cursor": encode_cursor(rows[-1][2], rows[-1][0].id) if has_next else None
             },
-            "summary": {
-                "total_matches": total_matches,
-                "team_0_matches": team_0_count,
-                "team_1_matches": team_1_count,
-                "wins": wins,
-                "losses": losses,
-                "win_rate": round(win_rate, 2)
-            }
+            "summary": summary
         }
 
     except Exception as e:
@@ -502,12 +494,16 @@ async def lookup_player_matches(
             db,
             data.profile_id.strip(),
             data.page,
-            data.page_size
+            data.page_size,
+            data.cursor,
+            data.include_summary
         )
 
         if "error" in result:
             if "does not exist" in result["error"]:
                 raise HTTPException(status_code=404, detail=result["error"])
+            elif "Invalid cursor" in result["error"]:
+                raise HTTPException(status_code=400, detail=result["error"])
             else:
                 raise HTTPException(status_code=500, detail=result["error"])
 
@@ -525,8 +521,10 @@ async def lookup_player_matches(
 class PlayerNameMatchesLookupModel(BaseModel):
     """Request model for player matches lookup with pagination."""
     name: str = Field(..., description="The player's profile uplay username")
-    page: int = Field(default=1, ge=1, description="Page number (1-indexed)")
+    page: int = Field(default=1, ge=1, description="Page number (1-indexed), ignored when a cursor is given")
     page_size: int = Field(default=10, ge=1, le=100, description="Number of matches per page")
+    cursor: Optional[str] = Field(default=None, description="next_cursor of the previous page, pages deep histories at a constant cost")
+    include_summary: bool = Field(default=True, description="Whether to count the summary statistics and the total")
 
 @router.post("/lookup/matches/name")
 async def lookup_player_matches(
@@ -549,19 +547,24 @@ async def lookup_player_matches(
 
         ubisoft_handler = request.app.state.ubisoft_handler
 
-        player: Player = await ubisoft_handler.lookup_via_uplay(data.name.strip())
+        # Only the profile id is needed here
+        player: Player = await ubisoft_handler.lookup_via_uplay(data.name.strip(), sections=())
 
         # Get the player's matches with summary statistics
         result = get_player_matches_with_summary(
             db,
             player.uid,
             data.page,
-            data.page_size
+            data.page_size,
+            data.cursor,
+            data.include_summary
         )
 
         if "error" in result:
             if "does not exist" in result["error"]:
                 raise HTTPException(status_code=404, detail=result["error"])
+            elif "Invalid cursor" in result["error"]:
+                raise HTTPException(status_code=400, detail=result["error"])
             else:
                 raise HTTPException(status_code=500, detail=result["error"])
 
@@ -583,38 +586,43 @@ async def get_all_bans(
         current_user = Depends(get_current_user),
         page: int = 1,
         limit: int = 25,
+        cursor: Optional[str] = None,
+        exact_total: bool = False,
 ):
     try:
-        # Calculate offset based on page and limit
-        offset = (page - 1) * limit
-
-        # Get total count for pagination info
-        total_bans = db.query(SiegeBan).count()
-
-        # Get paginated bans
-        bans = db.query(SiegeBan).offset(offset).limit(limit).all()
-
-        # If no bans are found, return empty list but not an error
-        if not bans:
-            return {
-                "bans": [],
-                "pagination": {
-                    "total": total_bans,
-                    "page": page,
-                    "limit": limit,
-                    "pages": (total_bans + limit - 1) // limit  # Ceiling division
-                }
-            }
-
+        # Newest first, seeking through the (created_at, id) index when paging with a cursor
+        query = db.query(SiegeBan).order_by(SiegeBan.created_at.desc(), SiegeBan.id.desc())
+        if cursor:
+            try:
+                query = query.filter(seek_after(SiegeBan.created_at, SiegeBan.id, decode_cursor(cursor)))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        else:
+            # Calculate offset based on page and limit
+            query = query.offset((page - 1) * limit)
+
+        # One extra row tells whether there is a next page
+        bans = query.limit(limit + 1).all()
+        has_next = len(bans) > limit
+        bans = bans[:limit]
+
+        # count() reads the whole table, the planner estimate is enough for showing a page count
+        total_bans = db.query(SiegeBan).count() if exact_total else estimate_count(db, SiegeBan.__tablename__)
+
+        # An empty page is not an error
         return {
             "bans": bans,
             "pagination": {
                 "total": total_bans,
-                "page": page,
+                "total_is_estimate": not exact_total,
+                "page": None if cursor else page,
                 "limit": limit,
-                "pages": (total_bans + limit - 1) // limit  # Ceiling division
+                "pages": (total_bans + limit - 1) // limit,  # Ceiling division
+                "next_cursor": encode_cursor(bans[-1].created_at, bans[-1].id) if has_next else None
             }
         }
+    except HTTPException:
+        raise
     except Exception as e:
         e_str = f"Exception: {str(e)}\n\nRequest data: {request.url}\nMethod: {request.method}\nHeaders: {dict(request.headers)}\nClient: {request.client}"
         logger.error(f"Error [Get All Bans]: {e_str}")
@@ -0,0 +1,179 @@
+from typing import Dict, Optional, Sequence
+import numpy as np
+
+# Same tables as UbisoftHandler.calculate_cheater_risk, keyed by the first word of the rank name
+KD_DEVIATION_THRESHOLDS: Dict[str, float] = {
+    "Copper": 1.5, "Bronze": 1.3, "Silver": 1.1, "Gold": 0.9,
+    "Platinum": 0.7, "Emerald": 0.5, "Diamond": 0.3, "Champions": 0.2
+}
+RANK_SENSITIVITIES: Dict[str, float] = {
+    "Copper": 0.5, "Bronze": 0.6, "Silver": 0.8, "Gold": 1.0,
+    "Platinum": 1.3, "Emerald": 1.5, "Diamond": 1.7, "Champions": 2.0
+}
+
+def _rank_table(ranks: Sequence[Optional[str]], table: Dict[str, float]) -> np.ndarray:
+    # Only the distinct rank names go through the dict, a lobby or a season has a handful of them
+    names, inverse = np.unique(np.array([rank or "" for rank in ranks], dtype=object), return_inverse=True)
+    values = np.array([table.get(name.split()[0] if name else "Gold", 1.0) for name in names], dtype=np.float64)
+    return values[inverse.reshape(-1)]
+
+def calculate_cheater_risk_batch(
+        wins: Sequence[int],
+        losses: Sequence[int],
+        abandons: Sequence[int],
+        kills: Sequence[int],
+        deaths: Sequence[int],
+        rank_ids: Sequence[int],
+        rank_points: Sequence[int],
+        ranks: Sequence[Optional[str]],
+        peak_rank_ids: Optional[Sequence[Optional[int]]] = None
+) -> np.ndarray:
+    """
+    Vectorized UbisoftHandler.calculate_cheater_risk, scoring a whole lobby or population at once.
+
+    Every step mirrors the scalar version operation for operation (same order, same float64 math),
+    so the scores are identical, see tests/test_cheater_risk.py for the equivalence check.
+
+    :param ranks: rank names, only their first word (the rank category) is used
+    :param peak_rank_ids: the peak_rank_id of each player's peak_rank_data, 0 or None when there is none
+    :return: int64 risk scores between 0 and 100
+    """
+    wins = np.asarray(wins, dtype=np.int64)
+    losses = np.asarray(losses, dtype=np.int64)
+    abandons = np.asarray(abandons, dtype=np.int64)
+    kills = np.asarray(kills, dtype=np.int64)
+    deaths = np.asarray(deaths, dtype=np.int64)
+    rank_ids = np.asarray(rank_ids, dtype=np.int64)
+    rank_points = np.asarray(rank_points, dtype=np.int64)
+    if peak_rank_ids is None:
+        peak_rank_ids = np.zeros(len(wins), dtype=np.int64)
+    else:
+        peak_rank_ids = np.array([peak or 0 for peak in peak_rank_ids], dtype=np.int64)
+
+    # 1. Basic calculations and data preparation
+    total_matches = wins + losses + abandons
+    kd_ratio = kills / np.maximum(1, deaths)
+    wl_ratio = wins / np.maximum(1, losses)
+
+    # 2. Match count confidence scaling
+    match_count_factor = np.minimum(1.0, (total_matches - 5) / 25)
+
+    # 3. Performance Anomaly Detection
+    expected_kd = 1.0
+    universal_ceiling = 2.2
+
+    adjusted_threshold = _rank_table(ranks, KD_DEVIATION_THRESHOLDS) * (1.5 - (match_count_factor * 0.5))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kd_anomaly = np.where(kd_ratio <= expected_kd, 0.0, np.maximum(0, (kd_ratio - expected_kd) / adjusted_threshold))
+
+    ceiling_excess = ((kd_ratio - universal_ceiling) / universal_ceiling) * match_count_factor
+    kd_anomaly = np.where(
+        (kd_ratio > universal_ceiling) & (total_matches > 10),
+        kd_anomaly + ceiling_excess * 2.0,
+        kd_anomaly
+    )
+
+    kd_anomaly = kd_anomaly * _rank_table(ranks, RANK_SENSITIVITIES)
+
+    expected_wl = 1.0
+    performance_anomaly = kd_anomaly * (1 + np.maximum(0, wl_ratio - expected_wl) * 0.5)
+
+    # 4. Match Experience Factor
+    expected_matches = np.maximum(15, 20 + ((rank_ids * 4) - 40))
+    match_experience_factor = np.where(
+        total_matches >= expected_matches,
+        0.0,
+        ((expected_matches - total_matches) / expected_matches) * 0.7
+    )
+
+    # 5. Rank Efficiency
+    starting_points = 1000
+    points_gained = np.where(peak_rank_ids != 0, peak_rank_ids, rank_points) - starting_points
+    points_per_match = points_gained / np.maximum(1, total_matches)
+
+    base_expected_points = 25 + (5000 / (rank_ids + 50))
+    rank_multiplier = 1.0 + (0.5 * (rank_ids / 40))
+    expected_points = base_expected_points * rank_multiplier
+
+    rank_efficiency = np.where(
+        points_per_match <= expected_points,
+        0.0,
+        np.minimum(2.0, (points_per_match / expected_points) - 1.0) * 0.5
+    )
+
+    # 6. Metric Consistency
+    kd_win_alignment = np.abs((kd_ratio - expected_kd) - (wl_ratio - expected_wl))
+    metric_consistency = np.minimum(1.0, kd_win_alignment / (1 + (total_matches / 50)))
+
+    # 7. Base risk score
+    cheater_risk = (
+            (performance_anomaly * 0.35) +
+            (match_experience_factor * 0.25) +
+            (rank_efficiency * 0.30) +
+            (metric_consistency * 0.10)
+    )
+
+    # 8. Safeguards against false positives
+    cheater_risk = np.where(
+        (kd_ratio < 0.9) & (total_matches > 20),
+        cheater_risk * 0.3,
+        np.where((kd_ratio < 1.0) & (total_matches > 30), cheater_risk * 0.5, cheater_risk)
+    )
+
+    # 9. Confidence factor based on match count
+    confidence_factor = np.minimum(1.0, (total_matches / 30))
+    confidence_factor = np.where(total_matches < 10, confidence_factor * 0.7, confidence_factor)
+
+    adjusted_risk = cheater_risk * confidence_factor
+
+    # 10. Scale to 0-100
+    final_score = np.minimum(100, np.maximum(0, (adjusted_risk / 1.5) * 100))
+
+    # 11. Final sanity check for edge cases
+    final_score = np.where(
+        (kd_ratio < 1.3) & (wl_ratio < 1.3) & (total_matches > 50),
+        np.minimum(final_score, 40),
+        final_score
+    )
+
+    # Too few matches for a reliable assessment
+    return np.where(total_matches < 5, 15, np.trunc(final_score)).astype(np.int64)
+
+def main(profiles: int = 50_000):
+    # Scalar vs batch timing over random profiles, equivalence is covered by tests/test_cheater_risk.py
+    from services.ubisoft_handler import UbisoftHandler
+    from types import SimpleNamespace
+    import random
+    import time
+
+    rng = random.Random(0)
+    rank_names = ["Copper 5", "Bronze 1", "Silver 3", "Gold 2", "Platinum 4", "Emerald 1", "Diamond 3", "Champions"]
+    population = [
+        SimpleNamespace(
+            wins=rng.randint(0, 400),
+            losses=rng.randint(0, 400),
+            abandons=rng.randint(0, 20),
+            kills=rng.randint(0, 8000),
+            deaths=rng.randint(0, 6000),
+            rank_id=rng.randint(0, 36),
+            rank_points=rng.randint(0, 6000),
+            rank=rng.choice(rank_names)
+        )
+        for _ in range(profiles)
+    ]
+    peaks = [rng.choice([None, {"peak_rank_id": rng.randint(1, 36)}]) for _ in range(profiles)]
+
+    started = time.perf_counter()
+    for profile, peak in zip(population, peaks):
+        UbisoftHandler.calculate_cheater_risk(profile, peak)
+    scalar_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    UbisoftHandler.calculate_cheater_risks(population, peaks)
+    batch_seconds = time.perf_counter() - started
+
+    print(f"{profiles} profiles, scalar: {scalar_seconds * 1000:.1f}ms, batch: {batch_seconds * 1000:.1f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,106 @@
-import requests
 import os
 from dotenv import load_dotenv
+from typing import Dict, List, Optional
+import aiohttp
+import asyncio
+import logging
+import orjson
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+STEAM_VANITY_URL = "https://api.steampowered.com/ISteamUser/ResolveVanityURL/v1/"
+STEAM_TIMEOUT = aiohttp.ClientTimeout(total=5, connect=2)
+# Vanity -> SteamID64 mappings almost never change
+STEAM_VANITY_TTL_SECONDS = 30 * 24 * 60 * 60
+STEAM_VANITY_MEMORY_MAX = 10_000
+
 class LinkedAccountParser:
-    def __init__(self):
-        pass
-
-    @staticmethod
-    def resolve_steam_vanity_url(vanity_url: str):
-        response = requests.get(
-            "https://api.steampowered.com/ISteamUser/ResolveVanityURL/v1/",
-            params={
-                "key": os.getenv("STEAM_WEB_API_KEY"),
-                "vanityurl": vanity_url
-            }
-        )
-        data = response.json()
-
-        if data.get("response").get("success") == 1:
-            return data.get("response").get("steamid")
-        elif data.get("response").get("success") == 42:
+    def __init__(self, redis_client=None):
+        self.redis_client = redis_client
+        self.session: Optional[aiohttp.ClientSession] = None
+        # In-process copy of the Redis cache, checked first
+        self._steam_ids: Dict[str, str] = {}
+
+    async def initialize(self) -> None:
+        """
+        Create the pooled HTTP session, this has to run inside the event loop that will use it.
+        """
+        connector = aiohttp.TCPConnector(limit=20, ttl_dns_cache=300, enable_cleanup_closed=True)
+        self.session = aiohttp.ClientSession(connector=connector, timeout=STEAM_TIMEOUT)
+
+    async def resolve_steam_vanity_urls(self, vanity_urls: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Resolve many vanity urls to SteamID64s, stored mappings are returned without a network call.
+
+        Both resolved ids and "not a vanity url" (42) answers are stored for STEAM_VANITY_TTL_SECONDS,
+        failed lookups are not stored so they are tried again next time.
+
+        :return: steam id (or the input itself when it isn't a vanity url) keyed by vanity url, None when it failed
+        """
+        vanity_urls = list(dict.fromkeys(vanity_url for vanity_url in vanity_urls if vanity_url))
+        resolved: Dict[str, Optional[str]] = {
+            vanity_url: self._steam_ids[vanity_url] for vanity_url in vanity_urls if vanity_url in self._steam_ids
+        }
+
+        missing = [vanity_url for vanity_url in vanity_urls if vanity_url not in resolved]
+        if missing and self.redis_client:
+            cached = await self.redis_client.get_many([f"steam:vanity:{vanity_url}" for vanity_url in missing])
+            for vanity_url, value in zip(missing, cached):
+                if value:
+                    resolved[vanity_url] = self._remember(vanity_url, value.decode("utf-8"))
+            missing = [vanity_url for vanity_url in missing if vanity_url not in resolved]
+
+        if not missing:
+            return resolved
+
+        # The Steam API has no batch endpoint, resolve the rest concurrently
+        steam_ids = await asyncio.gather(*(self._resolve_remote(vanity_url) for vanity_url in missing))
+        fetched = {vanity_url: steam_id for vanity_url, steam_id in zip(missing, steam_ids)}
+        resolved.update(fetched)
+
+        stored = {vanity_url: self._remember(vanity_url, steam_id) for vanity_url, steam_id in fetched.items() if steam_id}
+        if stored and self.redis_client:
+            await self.redis_client.set_many(
+                (f"steam:vanity:{vanity_url}", steam_id.encode("utf-8"), STEAM_VANITY_TTL_SECONDS)
+                for vanity_url, steam_id in stored.items()
+            )
+
+        return resolved
+
+    def _remember(self, vanity_url: str, steam_id: str) -> str:
+        if vanity_url not in self._steam_ids and len(self._steam_ids) >= STEAM_VANITY_MEMORY_MAX:
+            # Dicts keep insertion order, the first key is the oldest entry
+            del self._steam_ids[next(iter(self._steam_ids))]
+        self._steam_ids[vanity_url] = steam_id
+        return steam_id
+
+    async def _resolve_remote(self, vanity_url: str) -> Optional[str]:
+        params = {
+            "key": os.getenv("STEAM_WEB_API_KEY"),
+            "vanityurl": vanity_url
+        }
+        try:
+            async with self.session.get(STEAM_VANITY_URL, params=params) as response:
+                data = orjson.loads(await response.read())
+        except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError) as e:
+            logger.error(f"[steam] Failed to resolve vanity url {vanity_url}: {e}")
+            return None
+
+        result = data.get("response") if isinstance(data, dict) else None
+        if not isinstance(result, dict):
+            logger.error(f"[steam] Unexpected vanity url response for {vanity_url}: {data}")
+            return None
+
+        if result.get("success") == 1:
+            return result.get("steamid")
+        elif result.get("success") == 42:
             # probably not a vanity url if it gets this status code
             return vanity_url
         else:
             return None
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
@@ -1,17 +1,44 @@
 from dotenv import load_dotenv
-from typing import Callable, Any
+from typing import Callable, Any, Dict, Iterable, List, Optional, Tuple
+import asyncio
 import json
+import logging
 import os
 import redis
+import redis.asyncio
+import uuid
 
 load_dotenv()
 
+# Deletes a lock only if it still holds our token, so an expired lock taken over by someone else is left alone
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Writes a key only if a guard key still holds the value read earlier ("" standing for missing)
+SET_IF_UNCHANGED_SCRIPT = """
+if (redis.call("get", KEYS[2]) or "") == ARGV[1] then
+    return redis.call("set", KEYS[1], ARGV[2], "EX", ARGV[3])
+end
+return false
+"""
+
+logger = logging.getLogger(__name__)
+
 class RedisClient:
     def __init__(self):
         self.redis = redis.Redis.from_url(
             os.getenv("REDISCLOUD_URL"),
             decode_responses=True
         )
+        # Used from the event loop, values are raw bytes so callers can pick their own encoding
+        self.async_redis = redis.asyncio.Redis.from_url(
+            os.getenv("REDISCLOUD_URL"),
+            decode_responses=False
+        )
 
     def cache_for_key(self, key: str, func: Callable[[], Any], ttl: int = 900) -> Any:
         try:
@@ -28,3 +55,125 @@ class RedisClient:
             pass  # cache silently fails
 
         return result
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        """
+        Read several keys in a single round trip.
+
+        :return: the raw values in the order of keys, None for missing keys or when Redis is unavailable
+        """
+        if not keys:
+            return []
+
+        try:
+            return await self.async_redis.mget(keys)
+        except redis.RedisError as e:
+            logger.warning(f"[redis] MGET of {len(keys)} keys failed: {e}")
+            return [None] * len(keys)
+
+    async def set_many(
+            self,
+            entries: Iterable[Tuple[str, bytes, int]],
+            delete: Iterable[str] = (),
+            incr: Iterable[Tuple[str, int]] = ()
+    ) -> None:
+        """
+        Write several keys with their own TTL in a single round trip.
+
+        :param entries: (key, value, ttl in seconds) tuples
+        :param delete: keys to drop in the same round trip, e.g. entries derived from the ones written
+        :param incr: (key, ttl in seconds) counters to increment in the same round trip, e.g. write generations
+        """
+        entries = list(entries)
+        delete = list(delete)
+        incr = list(incr)
+        if not entries and not delete and not incr:
+            return
+
+        try:
+            async with self.async_redis.pipeline(transaction=False) as pipe:
+                for key, value, ttl in entries:
+                    pipe.setex(key, ttl, value)
+                if delete:
+                    pipe.delete(*delete)
+                for key, ttl in incr:
+                    pipe.incr(key)
+                    pipe.expire(key, ttl)
+                await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"[redis] Pipelined SETEX of {len(entries)} keys failed: {e}")
+
+    async def set_if_unchanged(self, key: str, value: bytes, ttl: int, guard_key: str, expected: Optional[bytes]) -> bool:
+        """
+        Write a key only if guard_key still holds the value read earlier, atomically.
+
+        :param expected: value of guard_key read before building value, None when it was missing
+        :return: whether the key was written
+        """
+        try:
+            return bool(await self.async_redis.eval(SET_IF_UNCHANGED_SCRIPT, 2, key, guard_key, expected or b"", value, ttl))
+        except redis.RedisError as e:
+            logger.warning(f"[redis] Guarded SET of {key} failed: {e}")
+            return False
+
+    async def try_lock_many(self, keys: List[str], ttl_ms: int) -> Dict[str, str]:
+        """
+        Try to take a short lived lock on every key (SET NX PX), in a single round trip.
+
+        :return: tokens of the locks we got, keyed by lock key. When Redis is unavailable every lock
+            is reported as taken by us, so callers just do the work themselves
+        """
+        if not keys:
+            return {}
+
+        tokens = {key: uuid.uuid4().hex for key in keys}
+        try:
+            async with self.async_redis.pipeline(transaction=False) as pipe:
+                for key, token in tokens.items():
+                    pipe.set(key, token, nx=True, px=ttl_ms)
+                acquired = await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"[redis] Taking {len(keys)} locks failed: {e}")
+            return tokens
+
+        return {key: token for (key, token), ok in zip(tokens.items(), acquired) if ok}
+
+    async def unlock_many(self, tokens: Dict[str, str]) -> None:
+        if not tokens:
+            return
+
+        try:
+            async with self.async_redis.pipeline(transaction=False) as pipe:
+                for key, token in tokens.items():
+                    pipe.eval(RELEASE_LOCK_SCRIPT, 1, key, token)
+                await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"[redis] Releasing {len(tokens)} locks failed: {e}")
+
+    async def wait_unlocked(self, keys: List[str], timeout: float, poll_interval: float) -> List[str]:
+        """
+        Wait for locks held by someone else to be released.
+
+        :return: the keys still locked once timeout runs out
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while keys:
+            try:
+                async with self.async_redis.pipeline(transaction=False) as pipe:
+                    for key in keys:
+                        pipe.exists(key)
+                    locked = await pipe.execute()
+            except redis.RedisError as e:
+                logger.warning(f"[redis] Checking {len(keys)} locks failed: {e}")
+                return keys
+
+            keys = [key for key, is_locked in zip(keys, locked) if is_locked]
+            if not keys or loop.time() >= deadline:
+                break
+            await asyncio.sleep(poll_interval)
+
+        return keys
+
+    async def close(self) -> None:
+        await self.async_redis.aclose()
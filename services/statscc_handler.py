@@ -1,9 +1,15 @@
 import os
 from dotenv import load_dotenv
-import requests
+from typing import Optional
+import aiohttp
+import asyncio
+import orjson
 
 load_dotenv()
 
+STATSCC_TIMEOUT = aiohttp.ClientTimeout(total=5, connect=2)
+STATSCC_CONNECTION_LIMIT = 50
+
 class StatsCCHandler:
     def __init__(self):
         api_key = os.getenv('STATSCC_API_KEY')
@@ -12,13 +18,28 @@ class StatsCCHandler:
             "x-api-key": api_key,
             # "User-Agent": "siege-spider"
         }
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def initialize(self) -> None:
+        """
+        Create the pooled HTTP session, this has to run inside the event loop that will use it.
+        """
+        connector = aiohttp.TCPConnector(
+            limit=STATSCC_CONNECTION_LIMIT,
+            limit_per_host=STATSCC_CONNECTION_LIMIT,
+            ttl_dns_cache=300,
+            enable_cleanup_closed=True
+        )
+        self.session = aiohttp.ClientSession(connector=connector, headers=self.headers, timeout=STATSCC_TIMEOUT)
 
-    def cache_mechanism(self):
-        # TODO: "We recommend keeping a local cache, and updating it every 5 minutes for quick access."
-        # this needs to be on a global scale inheriting from requests library and overwriting it with redis cache access.
-        pass
+    async def _get(self, url: str) -> dict:
+        async with self.session.get(url) as r:
+            if r.status == 200:
+                return orjson.loads(await r.read())
+            else:
+                raise RuntimeError(f"Failed to run request (URL: {url})), response code: {r.status}\n\n{await r.text()}")
 
-    def fetch_by_profile_id(self, profile_id: str):
+    async def fetch_by_profile_id(self, profile_id: str):
         """
         Fetch profile by id
         GET https://r6.statsapi.net/profiles/{profile_id}
@@ -27,15 +48,33 @@ class StatsCCHandler:
         :return:
         """
         url = f"{self.base_url}/profiles/{profile_id}"
-        r = requests.get(url, headers=self.headers)
-        if r.status_code == 200:
-            if r.json().get('statusCode') == 404:
-                return {}
-            return r.json()
-        else:
-            raise RuntimeError(f"Failed to run request (URL: {url})), response code: {r.status_code}\n\n{r.text}")
-
-    def fetch_profile_by_username(self, username: str, platform: str = ["uplay"]):
+        data = await self._get(url)
+        if data.get('statusCode') == 404:
+            return {}
+        return data
+
+    @staticmethod
+    def project_profile(data: Optional[dict]) -> Optional[dict]:
+        """
+        Trim a fetch_by_profile_id response down to what format_player reads, this is what gets cached.
+
+        Keeps the max rank points of every season (for the peak rank) and the first profile ban
+        (the reputation status), in the same nesting as the full response.
+        """
+        if data is None:
+            return None
+
+        seasonal_records = data.get("seasonalRecords")
+        profile_bans = data.get("profileBans")
+        return {
+            "seasonalRecords": {
+                season: {"ranked": {"maxRankPoints": record["ranked"]["maxRankPoints"]}} if record and record.get("ranked") else {}
+                for season, record in seasonal_records.items()
+            } if seasonal_records else None,
+            "profileBans": profile_bans[:1] if profile_bans else None,
+        }
+
+    async def fetch_profile_by_username(self, username: str, platform: str = ["uplay"]):
         """
         Fetch profile by exact username on a platform
         GET https://r6.statsapi.net/profiles/lookup?displayName={username}&platform={platform}
@@ -46,13 +85,9 @@ class StatsCCHandler:
         :return:
         """
         url = f"{self.base_url}/profiles/lookup?displayName={username}&platform={platform}"
-        r = requests.get(url, headers=self.headers)
-        if r.status_code == 200:
-            return r.json()
-        else:
-            raise RuntimeError(f"Failed to run request (URL: {url})), response code: {r.status_code}\n\n{r.text}")
+        return await self._get(url)
 
-    def fetch_config(self):
+    async def fetch_config(self):
         """
         Config
         Fetch all the common data that all the other endpoints reference from. For example, rank in a response will reference response.ranks[rank] which gives you the display name.
@@ -62,23 +97,26 @@ class StatsCCHandler:
         :return:
         """
         url = f"{self.base_url}/v1/config"
-        r = requests.get(url,  headers=self.headers)
-        if r.status_code == 200:
-            return r.json()
-        else:
-            raise RuntimeError(f"Failed to run request (URL: {url})), response code: {r.status_code}\n\n{r.text}")
+        return await self._get(url)
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
 
-def main():
+async def main():
     statscc_handler = StatsCCHandler()
+    await statscc_handler.initialize()
 
-    # fetch_by_username = statscc_handler.fetch_profile_by_username("Ext", platform="uplay")
+    # fetch_by_username = await statscc_handler.fetch_profile_by_username("Ext", platform="uplay")
     # print(fetch_by_username)
 
-    fetch_by_profile_id = statscc_handler.fetch_by_profile_id("6f7a4584-8074-4340-ae63-b78621c75919")
+    fetch_by_profile_id = await statscc_handler.fetch_by_profile_id("6f7a4584-8074-4340-ae63-b78621c75919")
     print(fetch_by_profile_id)
 
-    config = statscc_handler.fetch_config()
+    config = await statscc_handler.fetch_config()
     print(config)
 
+    await statscc_handler.close()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
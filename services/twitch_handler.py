@@ -1,39 +1,107 @@
-import json
-import requests
+from typing import Dict, List, Optional
+from wrapper.helpers import chunked
+import aiohttp
+import asyncio
+import orjson
+
+TWITCH_TIMEOUT = aiohttp.ClientTimeout(total=5, connect=2)
+# Operations per batched GQL request, Twitch rejects larger batches
+TWITCH_GQL_BATCH_SIZE = 30
 
 class TwitchHandler:
     def __init__(self):
         self.base_url = "https://gql.twitch.tv/gql"
-
-    def check_stream_data(self, username: str):
-        payload = json.dumps([
-                {
-                    "operationName": "CommunityTab",
-                    "variables": {
-                        "login": username
-                    },
-                    "extensions": {
-                        "persistedQuery": {
-                            "version": 1,
-                            "sha256Hash": "2e71a3399875770c1e5d81a9774d9803129c44cf8f6bad64973aa0d239a88caf"
-                        }
-                    }
-                }
-            ])
-
-        headers = {
+        self.headers = {
             'Client-Id': 'kimne78kx3ncx6brgo4mv6wki5h1ko',
             'X-Device-Id': 'Jkz41qWBcHP8apxspDJUL8oi05k6I1ei',
             'Content-Type': 'application/json'
         }
+        self.session: Optional[aiohttp.ClientSession] = None
 
-        response = requests.post(self.base_url, headers=headers, data=payload)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise RuntimeError(f"Failed to run request (URL: {self.base_url})), response code: {response.status_code}\n\n{response.text}")
+    async def initialize(self) -> None:
+        """
+        Create the pooled HTTP session, this has to run inside the event loop that will use it.
+        """
+        connector = aiohttp.TCPConnector(limit=20, ttl_dns_cache=300, enable_cleanup_closed=True)
+        self.session = aiohttp.ClientSession(connector=connector, headers=self.headers, timeout=TWITCH_TIMEOUT)
 
-if __name__ == "__main__":
+    @staticmethod
+    def _community_tab_operation(username: str) -> dict:
+        return {
+            "operationName": "CommunityTab",
+            "variables": {
+                "login": username
+            },
+            "extensions": {
+                "persistedQuery": {
+                    "version": 1,
+                    "sha256Hash": "2e71a3399875770c1e5d81a9774d9803129c44cf8f6bad64973aa0d239a88caf"
+                }
+            }
+        }
+
+    async def check_stream_data(self, username: str):
+        stream_data = await self.check_stream_data_batch([username])
+        return stream_data[username]
+
+    async def check_stream_data_batch(self, usernames: List[str]) -> Dict[str, list]:
+        """
+        Look up the stream data of many logins, packing up to TWITCH_GQL_BATCH_SIZE of them per GQL request.
+
+        :param usernames: twitch logins
+        :return: the response of every login keyed by login, in the same single operation list shape
+            check_stream_data returns
+        """
+        stream_data = {}
+        for chunk_data in await asyncio.gather(*(self._post_batch(chunk) for chunk in chunked(usernames, TWITCH_GQL_BATCH_SIZE))):
+            stream_data.update(chunk_data)
+
+        return stream_data
+
+    @staticmethod
+    def project_stream_data(stream_data: list) -> list:
+        """
+        Trim a check_stream_data response down to the user fields the API returns, this is what gets cached.
+
+        The data.user nesting is kept, only its id, login, displayName and stream are.
+        """
+        projected = []
+        for result in stream_data:
+            user = ((result or {}).get("data") or {}).get("user")
+            projected.append({
+                "data": {
+                    "user": {
+                        "id": user.get("id"),
+                        "login": user.get("login"),
+                        "displayName": user.get("displayName"),
+                        "stream": user.get("stream"),
+                    } if user else None
+                }
+            })
+        return projected
+
+    async def _post_batch(self, usernames: List[str]) -> Dict[str, list]:
+        payload = orjson.dumps([self._community_tab_operation(username) for username in usernames])
+
+        async with self.session.post(self.base_url, data=payload) as response:
+            if response.status == 200:
+                data = orjson.loads(await response.read())
+            else:
+                raise RuntimeError(f"Failed to run request (URL: {self.base_url})), response code: {response.status}\n\n{await response.text()}")
+
+        # Batched operations are answered in request order
+        return {username: [result] for username, result in zip(usernames, data)}
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+
+async def main():
     handler = TwitchHandler()
-    data = handler.check_stream_data("beaulo")
-    print(data)
\ No newline at end of file
+    await handler.initialize()
+    data = await handler.check_stream_data("beaulo")
+    print(data)
+    await handler.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
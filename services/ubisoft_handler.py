@@ -1,40 +1,116 @@
 from dotenv import load_dotenv
 from services.linked_account_parser import LinkedAccountParser
 from services.twitch_handler import TwitchHandler
-from typing import List
+from typing import Any, Awaitable, Dict, Iterable, List, Optional
 from wrapper.client import UbisoftClient
+from wrapper.constants import PLAYER_SECTION_TTLS
 from wrapper.helpers import get_rank_from_mmr
-from wrapper.models import LinkedAccount, Player
+from wrapper.models import FullProfile, LinkedAccount, Player
+from wrapper.player_cache import PlayerSectionCache
 from services.statscc_handler import StatsCCHandler
 from services.redis_client import RedisClient
+from services.cheater_risk import calculate_cheater_risk_batch
 import asyncio
 import logging
-import json
+import orjson
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+STATSCC_PREFETCH_GRACE_SECONDS = 30
+
+# Provider payloads are cached as projections (see project_profile / project_stream_data),
+# bump the version when a projection changes
+STATSCC_CACHE_KEY = "statscc:v2:{profile_id}"
+TWITCH_STREAM_DATA_CACHE_KEY = "twitch:stream_data:v2:{login}"
+PROVIDER_CACHE_TTL_SECONDS = 900
+
+# Upper bound for each enrichment of a formatted player, past it the enrichment is left null
+STATSCC_ENRICHMENT_TIMEOUT_SECONDS = 4
+TWITCH_ENRICHMENT_TIMEOUT_SECONDS = 3
+STEAM_ENRICHMENT_TIMEOUT_SECONDS = 3
+
+# Cached formatted players are dropped when a section is written, the TTL bounds how far behind
+# stats.cc / twitch data and soft expired sections can get
+FORMATTED_PLAYER_TTL_SECONDS = min(PLAYER_SECTION_TTLS.values())
+
 class UbisoftHandler:
     def __init__(self) -> None:
-        self.linked_account_parser = LinkedAccountParser()
+        self.redis_client = RedisClient()
+        self.linked_account_parser = LinkedAccountParser(redis_client=self.redis_client)
         self.twitch_handler = TwitchHandler()
         self.statscc_handler = StatsCCHandler()
-        self.redis_client = RedisClient()
         self.client = None
+        # stats.cc requests started as soon as a profile id is known, picked up by format_player
+        self._stats_cc_tasks: Dict[str, asyncio.Task] = {}
 
     async def initialize(self, email: str, password: str):
         self.client = UbisoftClient(email=email, password=password, redis_client=self.redis_client)
-
-    async def lookup_via_profile_id(self, profile_id: str) -> Player:
-        player = await self.client.get_player(uid=profile_id, platform="uplay")
+        await self.client.initialize()
+        await self.statscc_handler.initialize()
+        await self.twitch_handler.initialize()
+        await self.linked_account_parser.initialize()
+
+    async def lookup_via_profile_id(
+            self,
+            profile_id: str,
+            sections: Optional[Iterable[str]] = None,
+            degraded: Optional[List[str]] = None
+    ) -> Player:
+        # Full lookups get formatted afterwards, start their stats.cc request alongside the Ubisoft ones
+        if sections is None:
+            self.prefetch_stats_cc_data(profile_id)
+        player = await self.client.get_player(uid=profile_id, platform="uplay", sections=sections, degraded=degraded)
         return player
 
-    async def lookup_via_uplay(self, uplay: str) -> Player:
-        player = await self.client.get_player(name=uplay, platform="uplay")
+    async def lookup_via_uplay(self, uplay: str, sections: Optional[Iterable[str]] = None) -> Player:
+        player = await self.client.get_player(
+            name=uplay,
+            platform="uplay",
+            sections=sections,
+            on_profile_id=self.prefetch_stats_cc_data if sections is None else None
+        )
         return player
 
+    async def lookup_via_profile_ids(self, profile_ids: List[str], sections: Optional[Iterable[str]] = None) -> Dict[str, Player]:
+        if sections is None:
+            for profile_id in profile_ids:
+                self.prefetch_stats_cc_data(profile_id)
+        players = await self.client.get_players(uids=profile_ids, platform="uplay", sections=sections)
+        return players
+
+    async def lookup_formatted_player(self, profile_id: str) -> bytes:
+        """
+        The formatted player as encoded JSON, served straight from the response cache when possible.
+
+        Only complete responses are cached: one with a player section that failed or was served stale,
+        or with an enrichment that failed or timed out, is rebuilt on the next lookup. The write is
+        skipped as well when a section of the player was written since it was read, including the
+        sections this lookup fetched itself.
+        """
+        response_key = PlayerSectionCache.response_key(profile_id)
+        generation_key = PlayerSectionCache.generation_key(profile_id)
+        generation = None
+        if self.redis_client:
+            # The generation is read before any section, a write after this point fails the guarded SET
+            cached, generation = await self.redis_client.get_many([response_key, generation_key])
+            if cached:
+                return cached
+
+        degraded: List[str] = []
+        player = await self.lookup_via_profile_id(profile_id, degraded=degraded)
+        content = orjson.dumps(await self.format_player(player, degraded=degraded))
+        if self.redis_client and not degraded:
+            await self.redis_client.set_if_unchanged(response_key, content, FORMATTED_PLAYER_TTL_SECONDS, generation_key, generation)
+        return content
+
+    async def convert_uplay_to_profile_id(self, uplay: str) -> str:
+        # Only the name resolution is needed, skip every other section
+        player = await self.lookup_via_uplay(uplay, sections=())
+        return player.uid
+
     def format_profile(self, profile, add_risk_score=False, get_highest_rank=False, stats_cc_data=None):
         peak_rank_data = self.get_peak_rank(stats_cc_data) if get_highest_rank else None
         cheater_risk_score = self.calculate_cheater_risk(profile, peak_rank_data) if add_risk_score else None
@@ -143,7 +219,7 @@ class UbisoftHandler:
         # 5. Rank Efficiency - FIXED to prevent false positives for high ranks
         starting_points = 1000
 
-        if peak_rank_data.get('peak_rank_id'):
+        if peak_rank_data and peak_rank_data.get('peak_rank_id'):
             points_gained = peak_rank_data['peak_rank_id'] - starting_points
         else:
             points_gained = profile.rank_points - starting_points
@@ -201,6 +277,30 @@ class UbisoftHandler:
 
         return int(final_score)
 
+    @staticmethod
+    def calculate_cheater_risks(profiles: List[FullProfile], peak_rank_datas: Optional[List[Optional[dict]]] = None) -> List[int]:
+        """
+        calculate_cheater_risk for many profiles at once, with identical results.
+
+        :param profiles: profiles to score, e.g. a whole lobby or every stored profile after a formula change
+        :param peak_rank_datas: peak rank data of each profile, as returned by get_peak_rank
+        """
+        if not profiles:
+            return []
+
+        peak_rank_datas = peak_rank_datas or [None] * len(profiles)
+        return calculate_cheater_risk_batch(
+            wins=[profile.wins for profile in profiles],
+            losses=[profile.losses for profile in profiles],
+            abandons=[profile.abandons for profile in profiles],
+            kills=[profile.kills for profile in profiles],
+            deaths=[profile.deaths for profile in profiles],
+            rank_ids=[profile.rank_id for profile in profiles],
+            rank_points=[profile.rank_points for profile in profiles],
+            ranks=[profile.rank for profile in profiles],
+            peak_rank_ids=[peak.get("peak_rank_id") if peak else None for peak in peak_rank_datas]
+        ).tolist()
+
     @staticmethod
     def get_peak_rank(response):
         if response is None:
@@ -222,8 +322,52 @@ class UbisoftHandler:
             }
         return None
 
-    def format_player(self, player: Player):
-        stats_cc_data = self.get_stats_cc_data(player.id)
+    async def format_players(self, players: List[Player], degraded: Optional[List[str]] = None) -> List[dict]:
+        """
+        Format several players at once, their twitch stream data and steam ids are looked up in one batch.
+
+        A lobby wide lookup that fails or times out leaves those fields null for every player, it is
+        not retried per player, so a stalled provider costs its timeout once.
+
+        :param degraded: collects the providers that failed or timed out
+        """
+        logins = [login for player in players if (login := self._twitch_login(player.linked_accounts))]
+        vanity_urls = [vanity_url for player in players for vanity_url in self._steam_vanity_urls(player.linked_accounts)]
+        stream_data, steam_ids = await asyncio.gather(
+            self._enrich("twitch", "lobby", self.get_twitch_stream_data(logins), TWITCH_ENRICHMENT_TIMEOUT_SECONDS, degraded),
+            self._enrich("steam", "lobby", self.linked_account_parser.resolve_steam_vanity_urls(vanity_urls), STEAM_ENRICHMENT_TIMEOUT_SECONDS, degraded)
+        )
+        return list(await asyncio.gather(*(
+            self.format_player(player, stream_data=stream_data or {}, steam_ids=steam_ids or {}, degraded=degraded)
+            for player in players
+        )))
+
+    async def format_player(
+            self,
+            player: Player,
+            stream_data: Optional[Dict[str, Any]] = None,
+            steam_ids: Optional[Dict[str, Optional[str]]] = None,
+            degraded: Optional[List[str]] = None
+    ):
+        """
+        Format a player for the API, every enrichment (stats.cc, twitch, steam) is loaded concurrently
+        and a provider that fails or runs past its timeout just leaves its fields null.
+
+        :param stream_data: twitch stream data already looked up by format_players, keyed by login,
+            logins left out have no stream data and are not looked up again
+        :param steam_ids: steam ids already resolved by format_players, keyed by vanity url
+        :param degraded: collects the providers that failed or timed out
+        """
+        steam_lookup = None
+        if steam_ids is None:
+            steam_lookup = self.linked_account_parser.resolve_steam_vanity_urls(self._steam_vanity_urls(player.linked_accounts))
+
+        stats_cc_data, twitch_info, looked_up_steam_ids = await asyncio.gather(
+            self._enrich("statscc", player.id, self.get_stats_cc_data(player.id), STATSCC_ENRICHMENT_TIMEOUT_SECONDS, degraded),
+            self._enrich("twitch", player.id, self.get_twitch_info(player.linked_accounts, stream_data), TWITCH_ENRICHMENT_TIMEOUT_SECONDS, degraded),
+            self._enrich("steam", player.id, steam_lookup, STEAM_ENRICHMENT_TIMEOUT_SECONDS, degraded)
+        )
+        steam_ids = steam_ids if steam_ids is not None else looked_up_steam_ids or {}
 
         return {
             "player": {
@@ -234,7 +378,7 @@ class UbisoftHandler:
                 "reputation_gg_status": self.get_rep_gg_status(stats_cc_data),
                 "r6_tracker_link": f"https://r6.tracker.network/r6siege/profile/ubi/{player.name}/overview",
                 "statscc_link": f"https://stats.cc/siege/{player.name}/{player.id}",
-                "twitch_info": self.get_twitch_info(player.linked_accounts),
+                "twitch_info": twitch_info,
                 "current_platform_info": player.current_platform_info,
                 "linked_accounts": [
                     {
@@ -243,7 +387,7 @@ class UbisoftHandler:
                         "platform_type": acc.platform_type,
                         "id_on_platform": acc.id_on_platform,
                         "name_on_platform": acc.name_on_platform,
-                        "info_link": self._get_info_link(acc),
+                        "info_link": self._get_info_link(acc, steam_ids),
                     }
                     for acc in player.linked_accounts
                 ],
@@ -251,7 +395,7 @@ class UbisoftHandler:
                     "tag": player.persona.nickname,
                     "enabled": player.persona.enabled,
                     "nickname": player.persona.nickname,
-                },
+                } if player.persona else None,
                 "playtime": {
                     "pvp_time_played": player.pvp_time_played,
                     "pve_time_played": player.pve_time_played,
@@ -275,65 +419,153 @@ class UbisoftHandler:
             }
         }
 
-    def get_stats_cc_data(self, profile_id: str):
-        key = f"statscc:{profile_id}"
+    @staticmethod
+    async def _enrich(
+            provider: str,
+            target: str,
+            coro: Optional[Awaitable],
+            timeout: float,
+            degraded: Optional[List[str]] = None
+    ) -> Optional[Any]:
+        """
+        Await one enrichment, turning a failure or a timeout into None.
+
+        :param provider: provider name, used for logging
+        :param target: profile id (or lobby) the enrichment is for, used for logging
+        :param coro: coroutine loading the enrichment, or None when there is nothing to load
+        :param degraded: provider gets appended to it when the enrichment failed or timed out
+        """
+        if coro is None:
+            return None
+
+        try:
+            return await asyncio.wait_for(coro, timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"[{provider}] Timed out after {timeout}s for {target}")
+        except Exception as e:
+            logger.error(f"[{provider}] Failed to load for {target}. Error: {e}")
+        if degraded is not None:
+            degraded.append(provider)
+        return None
+
+    def prefetch_stats_cc_data(self, profile_id: str) -> None:
+        """
+        Start fetching the stats.cc data of a profile in the background, get_stats_cc_data picks it up.
+        """
+        if profile_id in self._stats_cc_tasks:
+            return
+
+        task = asyncio.create_task(self._load_stats_cc_data(profile_id))
+        self._stats_cc_tasks[profile_id] = task
+
+        def forget(finished: asyncio.Task) -> None:
+            # A failure is raised again to whoever awaits the task, mark it retrieved so it isn't
+            # logged as never retrieved when no format_player comes for it
+            if not finished.cancelled():
+                finished.exception()
+            # Keep the result around for a bit in case format_player comes late, then let it go
+            asyncio.get_running_loop().call_later(STATSCC_PREFETCH_GRACE_SECONDS, self._forget_stats_cc_task, profile_id, task)
+
+        task.add_done_callback(forget)
+
+    def _forget_stats_cc_task(self, profile_id: str, task: asyncio.Task) -> None:
+        if self._stats_cc_tasks.get(profile_id) is task:
+            del self._stats_cc_tasks[profile_id]
+
+    async def get_stats_cc_data(self, profile_id: str):
+        task = self._stats_cc_tasks.pop(profile_id, None)
+        if task is None:
+            return await self._load_stats_cc_data(profile_id)
+        return await task
+
+    async def _load_stats_cc_data(self, profile_id: str):
+        """
+        :raises Exception: when stats.cc fails, so format_player reports the enrichment as degraded
+        """
+        key = STATSCC_CACHE_KEY.format(profile_id=profile_id)
 
         if self.redis_client:
-            cached = self.redis_client.cache_for_key(key, lambda: None)
+            cached, = await self.redis_client.get_many([key])
             if cached:
                 logger.info(f"[statscc] Cache hit on {profile_id}")
-                return cached
+                return orjson.loads(cached)
 
-        try:
-            response = self.statscc_handler.fetch_by_profile_id(profile_id)
-            if self.redis_client:
-                self.redis_client.redis.setex(key, 900, json.dumps(response))
-            return response
-        except Exception as e:
-            logger.error(f"Encountered exception when attempting to fetch info from stats.cc (profile id: {profile_id}). Error: \n\n{e}")
+        response = self.statscc_handler.project_profile(await self.statscc_handler.fetch_by_profile_id(profile_id))
+        if self.redis_client:
+            await self.redis_client.set_many([(key, orjson.dumps(response), PROVIDER_CACHE_TTL_SECONDS)])
+        return response
 
     @staticmethod
     def get_rep_gg_status( response):
         try:
-            if response.get("profileBans"):
+            if response and response.get("profileBans"):
                 result = response["profileBans"][0]
                 return result
         except Exception as e:
             logger.error(f"Encountered exception when attempting to fetch info from rpe.gg (STATSCC handler). Error: \n\n{e}")
 
-    def get_twitch_info(self, linked_accounts: List[LinkedAccount]):
+    @staticmethod
+    def _twitch_login(linked_accounts: List[LinkedAccount]) -> Optional[str]:
+        twitch_users = [acc.name_on_platform for acc in linked_accounts if acc.platform_type == "twitch"]
+        return twitch_users[0].lower() if twitch_users and twitch_users[0] else None
+
+    async def get_twitch_info(self, linked_accounts: List[LinkedAccount], stream_data: Optional[Dict[str, Any]] = None):
         if not linked_accounts:
             return None
 
-        twitch_users = [acc.name_on_platform for acc in linked_accounts if acc.platform_type == "twitch"]
-        if not twitch_users:
+        twitch_username = self._twitch_login(linked_accounts)
+        if not twitch_username:
             return None
 
-        twitch_username = twitch_users[0]
-        stream_key = f"twitch:stream_data:{twitch_username}"
+        if stream_data is None:
+            stream_data = await self.get_twitch_stream_data([twitch_username])
+
+        return stream_data.get(twitch_username)
+
+    async def get_twitch_stream_data(self, logins: List[str]) -> Dict[str, Any]:
+        """
+        Look up the stream data of every login, from the cache or with one batched GQL request for the rest.
+
+        :return: stream data keyed by login
+        :raises Exception: when the GQL request fails, so format_player reports the enrichment as degraded
+        """
+        logins = list(dict.fromkeys(logins))
+        if not logins:
+            return {}
 
-        # Check stream cache
+        stream_data: Dict[str, Any] = {}
         if self.redis_client:
-            cached_stream = self.redis_client.cache_for_key(stream_key, lambda: None)
-            if cached_stream:
-                return cached_stream
+            cached = await self.redis_client.get_many([TWITCH_STREAM_DATA_CACHE_KEY.format(login=login) for login in logins])
+            stream_data = {login: orjson.loads(value) for login, value in zip(logins, cached) if value}
 
-        try:
-            # Fetch live data
-            response = self.twitch_handler.check_stream_data(twitch_username)
+        missing = [login for login in logins if login not in stream_data]
+        if not missing:
+            return stream_data
 
-            if self.redis_client:
-                # Cache stream data
-                self.redis_client.redis.setex(stream_key, 900, json.dumps(response))
+        # Fetch live data
+        fetched = {
+            login: self.twitch_handler.project_stream_data(response)
+            for login, response in (await self.twitch_handler.check_stream_data_batch(missing)).items()
+        }
 
-            return response
-        except Exception as e:
-            logger.error(f"Error fetching Twitch stream data for {twitch_username}: {e}")
-            return None
+        if self.redis_client:
+            # Cache stream data
+            await self.redis_client.set_many(
+                (TWITCH_STREAM_DATA_CACHE_KEY.format(login=login), orjson.dumps(response), PROVIDER_CACHE_TTL_SECONDS)
+                for login, response in fetched.items()
+            )
 
-    def _get_info_link(self, acc):
+        stream_data.update(fetched)
+        return stream_data
+
+    @staticmethod
+    def _steam_vanity_urls(linked_accounts: List[LinkedAccount]) -> List[str]:
+        return [acc.id_on_platform for acc in linked_accounts if acc.platform_type == "steam"]
+
+    @staticmethod
+    def _get_info_link(acc, steam_ids: Dict[str, Optional[str]]):
             if acc.platform_type == "steam":
-                return f"https://steamid.pro/lookup/{self.linked_account_parser.resolve_steam_vanity_url(acc.id_on_platform)}"
+                return f"https://steamid.pro/lookup/{steam_ids.get(acc.id_on_platform)}"
             elif acc.platform_type == "xbl":
                 return f"https://www.xbox.com/en-US/play/user/{acc.name_on_platform}"
             elif acc.platform_type == "psn":
@@ -348,7 +580,12 @@ class UbisoftHandler:
         return f"https://siege.locker/view?uid={profile_id}"
 
     async def close(self):
+        for task in self._stats_cc_tasks.values():
+            task.cancel()
         await self.client.close()
+        await self.statscc_handler.close()
+        await self.twitch_handler.close()
+        await self.linked_account_parser.close()
 
 async def main():
 
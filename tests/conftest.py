@@ -0,0 +1,84 @@
+from services.statscc_handler import StatsCCHandler
+from services.ubisoft_handler import UbisoftHandler
+from wrapper.models import CurrentPlatformInfo, FullProfile, Player
+import pytest
+
+class FakeRedis:
+    """
+    In memory stand-in for RedisClient, TTLs are ignored.
+    """
+    def __init__(self):
+        self.store = {}
+
+    async def get_many(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    async def set_many(self, entries, delete=(), incr=()):
+        for key, value, ttl in entries:
+            self.store[key] = value
+        for key in delete:
+            self.store.pop(key, None)
+        for key, ttl in incr:
+            self.store[key] = str(int(self.store.get(key, 0)) + 1).encode("utf-8")
+
+    async def set_if_unchanged(self, key, value, ttl, guard_key, expected):
+        if self.store.get(guard_key) != expected:
+            return False
+        self.store[key] = value
+        return True
+
+    async def try_lock_many(self, keys, ttl_ms):
+        return {key: "token" for key in keys}
+
+    async def unlock_many(self, tokens):
+        pass
+
+class NoSteam:
+    async def resolve_steam_vanity_urls(self, vanity_urls):
+        return {}
+
+@pytest.fixture
+def fake_redis() -> FakeRedis:
+    return FakeRedis()
+
+@pytest.fixture
+def make_profile():
+    def factory(**overrides) -> FullProfile:
+        fields = dict(
+            max_rank_id=26, max_rank_points=3700, rank_id=24, rank_points=3450, top_rank_position=0,
+            season_id=36, max_rank="Diamond 5", rank="Emerald 1", prev_rank_points=3400, next_rank_points=3500,
+            season_code="Y9S4", kills=900, deaths=300, abandons=1, losses=40, wins=110
+        )
+        fields.update(overrides)
+        return FullProfile(**fields)
+    return factory
+
+@pytest.fixture
+def make_player():
+    def factory(ranked_profile=None, profile_id: str = "profile-id") -> Player:
+        return Player(
+            id=profile_id, uid=profile_id,
+            profile_pic_url_146="", profile_pic_url_256="", profile_pic_url_500="", profile_pic_url="",
+            linked_accounts=[], name="name", persona=None,
+            level=200, xp=0, total_xp=0, xp_to_level_up=0,
+            total_time_played=0, total_time_played_hours=0, pvp_time_played=0, pve_time_played=0,
+            standard_profile=None, unranked_profile=None, ranked_profile=ranked_profile,
+            casual_profile=None, warmup_profile=None, event_profile=None,
+            current_platform_info=CurrentPlatformInfo("uplay")
+        )
+    return factory
+
+@pytest.fixture
+def make_handler():
+    """
+    UbisoftHandler without its network clients, pass in the fakes a test needs.
+    """
+    def factory(redis_client=None, client=None, statscc_handler=None, linked_account_parser=None) -> UbisoftHandler:
+        handler = UbisoftHandler.__new__(UbisoftHandler)
+        handler.redis_client = redis_client
+        handler.client = client
+        handler.statscc_handler = statscc_handler or StatsCCHandler()
+        handler.linked_account_parser = linked_account_parser or NoSteam()
+        handler._stats_cc_tasks = {}
+        return handler
+    return factory
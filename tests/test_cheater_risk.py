@@ -0,0 +1,94 @@
+from services.cheater_risk import calculate_cheater_risk_batch
+from services.ubisoft_handler import UbisoftHandler
+import random
+import pytest
+
+RANK_NAMES = [None, "", "Copper 5", "Bronze 1", "Silver 3", "Gold 2", "Platinum 4", "Emerald 1", "Diamond 3", "Champions", "Unranked"]
+
+def random_profile(make_profile, rng: random.Random, **overrides):
+    fields = dict(
+        wins=rng.randint(0, 400),
+        losses=rng.randint(0, 400),
+        abandons=rng.randint(0, 20),
+        kills=rng.randint(0, 8000),
+        deaths=rng.randint(0, 6000),
+        rank_id=rng.randint(0, 36),
+        rank_points=rng.randint(0, 6000),
+        rank=rng.choice(RANK_NAMES)
+    )
+    fields.update(overrides)
+    return make_profile(**fields)
+
+def score_batch(profiles, peaks):
+    return calculate_cheater_risk_batch(
+        wins=[profile.wins for profile in profiles],
+        losses=[profile.losses for profile in profiles],
+        abandons=[profile.abandons for profile in profiles],
+        kills=[profile.kills for profile in profiles],
+        deaths=[profile.deaths for profile in profiles],
+        rank_ids=[profile.rank_id for profile in profiles],
+        rank_points=[profile.rank_points for profile in profiles],
+        ranks=[profile.rank for profile in profiles],
+        peak_rank_ids=[peak.get("peak_rank_id") if peak else None for peak in peaks]
+    ).tolist()
+
+def assert_equivalent(profiles, peaks):
+    expected = [UbisoftHandler.calculate_cheater_risk(profile, peak) for profile, peak in zip(profiles, peaks)]
+    actual = score_batch(profiles, peaks)
+    mismatches = [(profiles[i], peaks[i], expected[i], actual[i]) for i in range(len(profiles)) if expected[i] != actual[i]]
+    assert not mismatches, mismatches[:5]
+
+@pytest.mark.parametrize("seed", range(5))
+def test_batch_matches_scalar_on_random_profiles(seed, make_profile):
+    rng = random.Random(seed)
+    profiles, peaks = [], []
+    for _ in range(5_000):
+        profile = random_profile(make_profile, rng)
+        if rng.random() < 0.2:
+            # Few matches, under the baseline and confidence thresholds
+            profile.wins, profile.losses, profile.abandons = rng.randint(0, 6), rng.randint(0, 6), rng.randint(0, 2)
+        profiles.append(profile)
+        peaks.append(rng.choice([None, {}, {"peak_rank_id": 0}, {"peak_rank_id": rng.randint(1, 36)}, {"peak_rank_id": rng.randint(1000, 6000)}]))
+    assert_equivalent(profiles, peaks)
+
+def test_batch_matches_scalar_on_branch_boundaries(make_profile):
+    # Total matches 5/10/20/30/50, K/D and W/L of exactly 0.9, 1.0, 1.3 and 2.2
+    rng = random.Random(0)
+    profiles = [
+        random_profile(make_profile, rng, wins=wins, losses=total - wins, abandons=0, kills=kills, deaths=deaths)
+        for total in (4, 5, 6, 9, 10, 11, 20, 21, 30, 31, 50, 51)
+        for kills, deaths in ((0, 0), (9, 10), (10, 10), (13, 10), (11, 5), (12, 5))
+        for wins in (0, total // 2, total - total // 4, total)
+    ]
+    for peak in (None, {}, {"peak_rank_id": 0}, {"peak_rank_id": 30}):
+        assert_equivalent(profiles, [peak] * len(profiles))
+
+@pytest.mark.parametrize("stats_cc_data", [None, {}, {"seasonalRecords": {}}])
+def test_batch_matches_scalar_without_stats_cc(stats_cc_data, make_profile):
+    # stats.cc timed out, failed, or has no ranked history: get_peak_rank gives no peak rank data
+    peak = UbisoftHandler.get_peak_rank(stats_cc_data)
+    assert peak is None
+
+    rng = random.Random(1)
+    profiles = [random_profile(make_profile, rng) for _ in range(1_000)]
+    assert_equivalent(profiles, [peak] * len(profiles))
+    assert UbisoftHandler.calculate_cheater_risks(profiles) == UbisoftHandler.calculate_cheater_risks(profiles, [peak] * len(profiles))
+
+def test_batch_without_peak_rank_ids_matches_missing_peaks(make_profile):
+    rng = random.Random(2)
+    profiles = [random_profile(make_profile, rng) for _ in range(1_000)]
+    without = calculate_cheater_risk_batch(
+        wins=[profile.wins for profile in profiles],
+        losses=[profile.losses for profile in profiles],
+        abandons=[profile.abandons for profile in profiles],
+        kills=[profile.kills for profile in profiles],
+        deaths=[profile.deaths for profile in profiles],
+        rank_ids=[profile.rank_id for profile in profiles],
+        rank_points=[profile.rank_points for profile in profiles],
+        ranks=[profile.rank for profile in profiles]
+    ).tolist()
+    assert without == score_batch(profiles, [None] * len(profiles))
+
+def test_empty_batch():
+    assert UbisoftHandler.calculate_cheater_risks([]) == []
+    assert score_batch([], []) == []
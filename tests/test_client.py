@@ -0,0 +1,50 @@
+from wrapper.client import UbisoftClient
+from wrapper.models import CurrentPlatformInfo, Persona
+import asyncio
+
+def make_client(redis=None):
+    """
+    Client whose persona / current platform fetches record whether profile resolution was still running.
+    """
+    client = UbisoftClient(email="email", password="password", redis_client=redis)
+    client.events = []
+
+    async def get_profiles_batch(profile_ids):
+        client.events.append("profiles started")
+        await asyncio.sleep(0.01)
+        client.events.append("profiles done")
+        return {
+            profile_id: [{"profileId": profile_id, "nameOnPlatform": f"name-{profile_id}", "platformType": "uplay"}]
+            for profile_id in profile_ids if profile_id != "unknown"
+        }
+
+    async def get_personas(profile_ids):
+        client.events.append("personas started")
+        return {profile_id: Persona(tag="tag", enabled=True, nickname="nick") for profile_id in profile_ids}
+
+    async def get_current_platform_infos(profile_ids):
+        client.events.append("platforms started")
+        return {profile_id: CurrentPlatformInfo("uplay") for profile_id in profile_ids}
+
+    client.get_profiles_batch = get_profiles_batch
+    client.get_personas = get_personas
+    client.get_current_platform_infos = get_current_platform_infos
+    return client
+
+def test_sections_are_fetched_alongside_profile_resolution():
+    client = make_client()
+
+    player = asyncio.run(client.get_player(uid="pid", sections={"persona", "current_platform_info"}))
+
+    assert player.name == "name-pid"
+    assert player.persona.nickname == "nick"
+    assert client.events.index("personas started") < client.events.index("profiles done")
+    assert client.events.index("platforms started") < client.events.index("profiles done")
+
+def test_sections_of_unknown_profile_ids_are_not_cached(fake_redis):
+    client = make_client(fake_redis)
+
+    players = asyncio.run(client.get_players(uids=["pid", "unknown"], sections={"persona", "current_platform_info"}))
+
+    assert list(players) == ["pid"]
+    assert not any("unknown" in key for key in fake_redis.store)
@@ -0,0 +1,29 @@
+import asyncio
+import pytest
+
+from wrapper import limiter
+from wrapper.limiter import AdaptiveLimiter
+
+
+def test_slot_granted_as_the_queue_timeout_fires_is_handed_back(monkeypatch):
+    async def run():
+        slots = AdaptiveLimiter("test", initial_limit=1, min_limit=1, max_limit=1)
+        started_at = await slots.acquire()
+
+        async def granted_then_timed_out(waiter, timeout):
+            # The holder releases and the slot goes to the queued waiter in the same tick the timeout fires
+            slots.release(started_at)
+            assert waiter.done() and not waiter.cancelled()
+            raise asyncio.TimeoutError
+
+        monkeypatch.setattr(limiter.asyncio, "wait_for", granted_then_timed_out)
+        with pytest.raises(asyncio.TimeoutError):
+            await slots.acquire()
+        monkeypatch.undo()
+
+        assert slots.in_flight == 0
+        assert slots.queue_timeouts == 1
+        await asyncio.wait_for(slots.acquire(), timeout=1)
+        assert slots.in_flight == 1
+
+    asyncio.run(run())
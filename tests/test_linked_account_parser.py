@@ -0,0 +1,52 @@
+import asyncio
+import orjson
+
+from services import linked_account_parser
+from services.linked_account_parser import LinkedAccountParser
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def read(self):
+        return orjson.dumps(self.payload)
+
+
+class FakeSession:
+    def __init__(self, payloads):
+        self.payloads = payloads
+
+    def get(self, url, params):
+        return FakeResponse(self.payloads[params["vanityurl"]])
+
+
+def test_unexpected_steam_payload_is_a_failed_lookup():
+    parser = LinkedAccountParser()
+    parser.session = FakeSession({
+        "no-response": {"error": "rate limited"},
+        "not-an-object": [],
+        "spider": {"response": {"success": 1, "steamid": "76561198000000000"}},
+    })
+
+    resolved = asyncio.run(parser.resolve_steam_vanity_urls(["no-response", "not-an-object", "spider"]))
+
+    assert resolved == {"no-response": None, "not-an-object": None, "spider": "76561198000000000"}
+
+
+def test_full_memory_cache_evicts_the_oldest_entry(monkeypatch):
+    monkeypatch.setattr(linked_account_parser, "STEAM_VANITY_MEMORY_MAX", 2)
+    parser = LinkedAccountParser()
+
+    parser._remember("first", "1")
+    parser._remember("second", "2")
+    parser._remember("second", "2")
+    parser._remember("third", "3")
+
+    assert parser._steam_ids == {"second": "2", "third": "3"}
@@ -0,0 +1,125 @@
+from wrapper.client import UbisoftClient
+from wrapper.codec import encode_section
+from wrapper.constants import PLAYER_SECTION_TTLS
+from wrapper.models import CurrentPlatformInfo, Persona
+from wrapper.player_cache import PlayerSectionCache
+import asyncio
+import orjson
+import time
+
+SECTIONS = frozenset({"persona", "current_platform_info"})
+
+def make_client(redis, fetched):
+    """
+    Client whose Ubiservices fetches return the given sections, any other missing section fails.
+    """
+    client = UbisoftClient(email="email", password="password", redis_client=redis)
+    client.refreshed = []
+
+    async def fetch_missing_sections(profile_ids, platform, sections, found, fresh):
+        for profile_id in profile_ids:
+            for section, value in fetched.items():
+                if section not in found[profile_id]:
+                    found[profile_id][section] = fresh[profile_id][section] = value
+
+    client._fetch_missing_sections = fetch_missing_sections
+    client._refresh_in_background = lambda stale, platform: client.refreshed.append(stale)
+    return client
+
+def cache_section(redis, section, value, written_at=None):
+    key = PlayerSectionCache.section_key(section, "pid")
+    redis.store[key] = encode_section(value, written_at if written_at is not None else time.time())
+
+def test_complete_player_is_not_degraded(fake_redis):
+    client = make_client(fake_redis, {"name": "name", "persona": Persona(tag="tag", enabled=True, nickname="nick"), "current_platform_info": CurrentPlatformInfo("uplay")})
+    degraded = []
+
+    player = asyncio.run(client.get_player(uid="pid", sections=SECTIONS, degraded=degraded))
+
+    assert player.name == "name"
+    assert degraded == []
+    assert fake_redis.store[PlayerSectionCache.generation_key("pid")] == b"1"
+
+def test_failed_section_is_degraded(fake_redis):
+    client = make_client(fake_redis, {"name": "name", "persona": Persona(tag="tag", enabled=True, nickname="nick")})
+    degraded = []
+
+    asyncio.run(client.get_player(uid="pid", sections=SECTIONS, degraded=degraded))
+
+    assert degraded == ["current_platform_info"]
+
+def test_stale_section_is_degraded(fake_redis):
+    client = make_client(fake_redis, {})
+    cache_section(fake_redis, "name", "name")
+    cache_section(fake_redis, "persona", Persona(tag="tag", enabled=True, nickname="nick"))
+    cache_section(fake_redis, "current_platform_info", CurrentPlatformInfo("uplay"), time.time() - PLAYER_SECTION_TTLS["current_platform_info"] - 1)
+    degraded = []
+
+    asyncio.run(client.get_player(uid="pid", sections=SECTIONS, degraded=degraded))
+
+    assert degraded == ["current_platform_info"]
+    assert client.refreshed == [{"pid": {"current_platform_info"}}]
+
+class FakeClient:
+    def __init__(self, player_degraded, during_load=None):
+        self.player_degraded = player_degraded
+        self.during_load = during_load
+
+    async def get_player(self, uid, platform, sections=None, degraded=None):
+        if self.during_load:
+            await self.during_load()
+        degraded.extend(self.player_degraded)
+        return uid
+
+def make_lookup_handler(make_handler, redis, player_degraded, during_load=None, during_format=None):
+    handler = make_handler(redis_client=redis, client=FakeClient(player_degraded, during_load))
+    handler.prefetch_stats_cc_data = lambda profile_id: None
+
+    async def format_player(player, degraded=None):
+        if during_format:
+            await during_format()
+        return {"player": {"profile_id": player}}
+
+    handler.format_player = format_player
+    return handler
+
+def test_formatted_player_is_cached_when_complete(fake_redis, make_handler):
+    handler = make_lookup_handler(make_handler, fake_redis, [])
+
+    content = asyncio.run(handler.lookup_formatted_player("pid"))
+
+    assert orjson.loads(content) == {"player": {"profile_id": "pid"}}
+    assert fake_redis.store[PlayerSectionCache.response_key("pid")] == content
+
+def test_formatted_player_is_not_cached_with_degraded_sections(fake_redis, make_handler):
+    handler = make_lookup_handler(make_handler, fake_redis, ["ranked_profiles"])
+
+    asyncio.run(handler.lookup_formatted_player("pid"))
+
+    assert PlayerSectionCache.response_key("pid") not in fake_redis.store
+
+def test_formatted_player_is_not_cached_after_a_concurrent_section_write(fake_redis, make_handler):
+    cache = PlayerSectionCache(fake_redis)
+
+    async def refresh():
+        # A background refresh lands while the response is being built
+        await cache.set_sections({"pid": {"current_platform_info": CurrentPlatformInfo("psn")}})
+
+    handler = make_lookup_handler(make_handler, fake_redis, [], during_format=refresh)
+
+    asyncio.run(handler.lookup_formatted_player("pid"))
+
+    assert PlayerSectionCache.response_key("pid") not in fake_redis.store
+
+def test_formatted_player_is_not_cached_after_a_section_write_during_load(fake_redis, make_handler):
+    cache = PlayerSectionCache(fake_redis)
+
+    async def write_section():
+        # Sections are written after the lookup started, e.g. by the load itself or a refresh
+        await cache.set_sections({"pid": {"current_platform_info": CurrentPlatformInfo("psn")}})
+
+    handler = make_lookup_handler(make_handler, fake_redis, [], during_load=write_section)
+
+    asyncio.run(handler.lookup_formatted_player("pid"))
+
+    assert PlayerSectionCache.response_key("pid") not in fake_redis.store
@@ -0,0 +1,89 @@
+from services import ubisoft_handler
+from services.statscc_handler import StatsCCHandler
+from services.ubisoft_handler import UbisoftHandler
+from wrapper.models import LinkedAccount
+import asyncio
+
+class StalledStatsCC(StatsCCHandler):
+    async def fetch_by_profile_id(self, profile_id):
+        await asyncio.sleep(60)
+
+class FailingStatsCC(StatsCCHandler):
+    async def fetch_by_profile_id(self, profile_id):
+        raise RuntimeError("stats.cc is down")
+
+def test_risk_score_without_peak_rank_data(make_profile):
+    profile = make_profile()
+    assert UbisoftHandler.calculate_cheater_risk(profile, None) == UbisoftHandler.calculate_cheater_risk(profile, {})
+
+def test_format_player_with_timed_out_stats_cc(monkeypatch, make_handler, make_player, make_profile):
+    monkeypatch.setattr(ubisoft_handler, "STATSCC_ENRICHMENT_TIMEOUT_SECONDS", 0.01)
+    handler = make_handler(statscc_handler=StalledStatsCC())
+    degraded = []
+
+    formatted = asyncio.run(handler.format_player(make_player(make_profile()), degraded=degraded))
+
+    ranked = formatted["player"]["stats"]["ranked"]
+    assert degraded == ["statscc"]
+    assert ranked["peak_rank_data"] is None
+    assert 0 <= ranked["risk_score"] <= 100
+    assert formatted["player"]["reputation_gg_status"] is None
+
+def test_format_player_with_failed_stats_cc(make_handler, make_player, make_profile):
+    handler = make_handler(statscc_handler=FailingStatsCC())
+    degraded = []
+
+    formatted = asyncio.run(handler.format_player(make_player(make_profile()), degraded=degraded))
+
+    ranked = formatted["player"]["stats"]["ranked"]
+    assert "statscc" in degraded
+    assert ranked["peak_rank_data"] is None
+    assert ranked["risk_score"] == UbisoftHandler.calculate_cheater_risk(make_profile(), None)
+
+def test_failed_twitch_lookup_is_degraded(make_handler):
+    class FailingTwitch:
+        async def check_stream_data_batch(self, logins):
+            raise RuntimeError("twitch is down")
+
+    handler = make_handler()
+    handler.twitch_handler = FailingTwitch()
+    degraded = []
+
+    twitch_info = asyncio.run(handler._enrich("twitch", "profile-id", handler.get_twitch_stream_data(["login"]), 1, degraded))
+
+    assert twitch_info is None
+    assert degraded == ["twitch"]
+
+def test_stalled_lobby_enrichments_are_not_retried_per_player(monkeypatch, make_handler, make_player):
+    monkeypatch.setattr(ubisoft_handler, "TWITCH_ENRICHMENT_TIMEOUT_SECONDS", 0.01)
+    monkeypatch.setattr(ubisoft_handler, "STEAM_ENRICHMENT_TIMEOUT_SECONDS", 0.01)
+    calls = []
+
+    class StalledTwitch:
+        async def check_stream_data_batch(self, logins):
+            calls.append("twitch")
+            await asyncio.sleep(60)
+
+    class StalledSteam:
+        async def resolve_steam_vanity_urls(self, vanity_urls):
+            calls.append("steam")
+            await asyncio.sleep(60)
+
+    handler = make_handler(linked_account_parser=StalledSteam())
+    handler.twitch_handler = StalledTwitch()
+    handler.get_stats_cc_data = lambda profile_id: asyncio.sleep(0, {})
+    players = []
+    for i in range(3):
+        player = make_player(profile_id=f"profile-{i}")
+        player.linked_accounts = [
+            LinkedAccount(profile_id=f"profile-{i}", user_id=f"profile-{i}", platform_type="twitch", id_on_platform="1", name_on_platform=f"streamer{i}"),
+            LinkedAccount(profile_id=f"profile-{i}", user_id=f"profile-{i}", platform_type="steam", id_on_platform=f"vanity{i}", name_on_platform="steam"),
+        ]
+        players.append(player)
+    degraded = []
+
+    formatted = asyncio.run(handler.format_players(players, degraded=degraded))
+
+    assert sorted(calls) == ["steam", "twitch"]
+    assert sorted(degraded) == ["steam", "twitch"]
+    assert all(player["player"]["twitch_info"] is None for player in formatted)
@@ -0,0 +1,110 @@
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional
+from wrapper.constants import TICKET_RENEW_BEFORE_SECONDS, TICKET_RENEW_RETRY_SECONDS
+from wrapper.models import AuthModel
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+class TicketManager:
+    """
+    Keeps Ubiservices session tickets in memory, one per app id.
+
+    Tickets are renewed in the background shortly before they expire, and when several
+    coroutines find a missing or expired ticket at once only one of them requests a new
+    session, the rest wait for its result.
+    """
+    def __init__(
+            self,
+            load: Optional[Callable[[str], Optional[AuthModel]]] = None,
+            save: Optional[Callable[[AuthModel], None]] = None,
+            renew_before: int = TICKET_RENEW_BEFORE_SECONDS
+    ):
+        self.load = load
+        self.save = save
+        self.renew_before = renew_before
+        self._tickets: Dict[str, AuthModel] = {}
+        self._expires_at: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._refreshers: Dict[str, Callable[[str], Awaitable[AuthModel]]] = {}
+        self._renewals: Dict[str, asyncio.Task] = {}
+        self._loaded: set = set()
+
+    async def get(self, appid: str, refresh: Callable[[str], Awaitable[AuthModel]]) -> AuthModel:
+        """
+        Return a valid ticket for the app id, requesting a new session through refresh if needed.
+
+        :param appid: Ubisoft app id the ticket is for
+        :param refresh: coroutine function creating a new session for the app id
+        :return: a ticket that is not expired
+        """
+        self._refreshers[appid] = refresh
+
+        ticket = self._tickets.get(appid)
+        if ticket is not None and time.time() < self._expires_at[appid]:
+            return ticket
+
+        lock = self._locks.setdefault(appid, asyncio.Lock())
+        async with lock:
+            # Another coroutine may have refreshed the ticket while we were waiting
+            ticket = self._tickets.get(appid)
+            if ticket is not None and time.time() < self._expires_at[appid]:
+                return ticket
+
+            # Tickets persisted by a previous process are only read once, on cold start
+            if appid not in self._loaded:
+                self._loaded.add(appid)
+                if self.load and (ticket := await asyncio.to_thread(self.load, appid)):
+                    self._store(ticket)
+                    return ticket
+
+            return await self._refresh(appid)
+
+    async def _refresh(self, appid: str) -> AuthModel:
+        ticket = await self._refreshers[appid](appid)
+        self._store(ticket)
+
+        if self.save:
+            try:
+                await asyncio.to_thread(self.save, ticket)
+            except OSError as e:
+                logger.warning(f"[auth] Failed to persist ticket for {appid}: {e}")
+
+        logger.info(f"[auth] Refreshed ticket for {appid}, expires {ticket.expiration}")
+        return ticket
+
+    def _store(self, ticket: AuthModel) -> None:
+        expires_at = self.parse_expiration(ticket.expiration)
+        self._tickets[ticket.appid] = ticket
+        self._expires_at[ticket.appid] = expires_at
+        self._schedule_renewal(ticket.appid, expires_at - self.renew_before - time.time())
+
+    def _schedule_renewal(self, appid: str, delay: float) -> None:
+        current = self._renewals.get(appid)
+        if current is not None and current is not asyncio.current_task():
+            current.cancel()
+
+        self._renewals[appid] = asyncio.create_task(self._renew(appid, max(0.0, delay)))
+
+    async def _renew(self, appid: str, delay: float) -> None:
+        await asyncio.sleep(delay)
+
+        async with self._locks.setdefault(appid, asyncio.Lock()):
+            try:
+                await self._refresh(appid)
+            except Exception as e:
+                # The current ticket is still valid for a while, try again before it runs out
+                logger.error(f"[auth] Background renewal failed for {appid}: {e}")
+                if time.time() < self._expires_at.get(appid, 0):
+                    self._schedule_renewal(appid, TICKET_RENEW_RETRY_SECONDS)
+
+    @staticmethod
+    def parse_expiration(expiration: str) -> float:
+        return datetime.fromisoformat(expiration.replace("Z", "+00:00")).timestamp()
+
+    async def close(self) -> None:
+        for task in self._renewals.values():
+            task.cancel()
+        self._renewals.clear()
@@ -15,41 +15,181 @@ from wrapper.helpers import (
     get_rank_constants,
     get_rank_from_mmr,
     season_id_to_code,
-    deserialize_player,
-    serialize
+    chunked
 )
+from wrapper.auth import TicketManager
+from wrapper.limiter import AdaptiveLimiter
+from wrapper.player_cache import PlayerSectionCache
+from wrapper.singleflight import SingleFlight
+from wrapper.resilience import CircuitBreaker, backoff_delay, parse_retry_after
 from wrapper.constants import (
     BASIC_APP_ID,
     ADVANCED_RANKED_APP_ID,
     PLATFORM_GROUP_MAP,
-    R6_PLATFORMS
+    R6_PLATFORMS,
+    PLAYER_SECTIONS,
+    SECTION_TIMEOUT_SECONDS,
+    PROFILES_BATCH_SIZE,
+    STATS_BATCH_SIZE,
+    FULL_PROFILES_BATCH_SIZE,
+    APPLICATIONS_BATCH_SIZE,
+    GRAPHQL_USERS_BATCH_SIZE,
+    RETRYABLE_STATUSES,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_AFTER_MAX_SECONDS,
+    REQUEST_DEADLINE_SECONDS,
+    REQUEST_TIMEOUT_SECONDS,
+    REQUEST_CONNECT_TIMEOUT_SECONDS,
+    HTTP_CONNECTION_LIMIT,
+    HTTP_CONNECTION_LIMIT_PER_HOST,
+    HTTP_DNS_CACHE_SECONDS,
+    HTTP_KEEPALIVE_SECONDS
 )
 from datetime import datetime, timezone
 from dotenv import load_dotenv
-from typing import List, Optional, Literal
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Literal, Set, Tuple
 import aiohttp
 import asyncio
 import base64
 import dataclasses
-from dataclasses import asdict, is_dataclass
 import json
+import logging
+import orjson
 import os
-import hashlib
 from urllib import parse
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+UBISOFT_REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS, connect=REQUEST_CONNECT_TIMEOUT_SECONDS)
+
+# Fallbacks used when a section fails so the rest of the player can still be returned
+EMPTY_PLAYTIME = Playtime(level=0, pvp_time_played=0, pve_time_played=0, total_time_played=0, total_time_played_hours=0)
+EMPTY_PROGRESS = Progress(level=0, xp=0, total_xp=0, xp_to_level_up=0)
+EMPTY_RANKED_PROFILES = RankedProfiles(
+    standard_profile=None,
+    unranked_profile=None,
+    ranked_profile=None,
+    casual_profile=None,
+    warmup_profile=None,
+    event_profile=None
+)
+
+# Used when a successful batch response leaves a profile out, these are cached like any other result
+MISSING_SECTION_DEFAULTS = {
+    "twitch": None,
+    "ranked_profiles": EMPTY_RANKED_PROFILES,
+    "current_platform_info": CurrentPlatformInfo("Unknown"),
+}
+
+GET_MULTIPLE_USER_PROFILES_QUERY = """query GetMultipleUserProfiles($userIds: [String!]!) {
+    users(userIds: $userIds) {
+        ...ProfileFragment
+    }
+}
+fragment ProfileFragment on User {
+    id
+    userId
+    avatarUrl
+    name
+    level
+    onlineStatus
+    games(filterBy: {isOwned: true}) { totalCount }
+    lastPlayedGame {
+        node {
+            id
+            name
+            bannerUrl: backgroundUrl
+            platform {
+                id
+                applicationId
+                name
+                type
+            }
+        }
+    }
+    currentOnlineGame {
+        node {
+            id
+            name
+            bannerUrl: backgroundUrl
+            platform {
+                id
+                applicationId
+                name
+                type
+            }
+        }
+    }
+    networks {
+        edges {
+            node {
+                id
+                publicCodeName
+            }
+            meta {
+                id
+                name
+            }
+        }
+    }
+}"""
+
+
+class UbisoftRequestError(Exception):
+    def __init__(self, status: Optional[int], reason: Optional[str], text: str, retry_after: Optional[float] = None):
+        super().__init__(f"Ubiservices request failed ({status} {reason}): {text[:500]}")
+        self.status = status
+        self.reason = reason
+        self.text = text
+        self.retry_after = retry_after
+
+class UbisoftResponseError(UbisoftRequestError):
+    """Raised for successful responses whose body is not JSON."""
+
+
 class UbisoftClient:
     def __init__(self, email: str, password: str, redis_client: Optional = None):
         self.email = email
         self.password = password
-        self.session = aiohttp.ClientSession()
+        self.session: Optional[aiohttp.ClientSession] = None
         self.redis = redis_client
+        self.section_cache = PlayerSectionCache(redis_client) if redis_client else None
+        # Concurrent lookups of the same name or player share one fetch
+        self.inflight = SingleFlight()
+        # Background refreshes of stale cached sections, keyed by profile id
+        self._refreshing: Dict[str, asyncio.Task] = {}
         self.creds_path: str = f"{os.getcwd()}/creds/"
+        self._basic_token = base64.b64encode(f"{email}:{password}".encode("utf-8")).decode("utf-8")
+        # The creds/ files only seed the in-memory tickets on cold start and persist refreshed ones
+        self.tickets = TicketManager(load=self.load_creds, save=self.save_creds)
+        # Ubisoft throttles per app id, so each one gets its own concurrency window
+        self.limiters: Dict[str, AdaptiveLimiter] = {
+            BASIC_APP_ID: AdaptiveLimiter("basic"),
+            ADVANCED_RANKED_APP_ID: AdaptiveLimiter("advanced_ranked"),
+        }
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    async def initialize(self) -> None:
+        """
+        Create the shared HTTP session, this has to run inside the event loop that will use it.
+        """
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_CONNECTION_LIMIT,
+            limit_per_host=HTTP_CONNECTION_LIMIT_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_CACHE_SECONDS,
+            keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+            enable_cleanup_closed=True
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=UBISOFT_REQUEST_TIMEOUT,
+            json_serialize=lambda obj: orjson.dumps(obj).decode("utf-8")
+        )
 
     def get_basic_token(self) -> str:
-        auth_str = f"{self.email}:{self.password}"
-        return base64.b64encode(auth_str.encode("utf-8")).decode("utf-8")
+        return self._basic_token
 
     def load_creds(self, appid: str) -> AuthModel | None:
         token = self.get_basic_token()
@@ -85,89 +225,261 @@ class UbisoftClient:
             json.dump(dataclasses.asdict(auth_model), f)
 
     async def fetch_auth_model_basic(self, appid: str) -> AuthModel:
-        token = self.get_basic_token()
+        return await self.tickets.get(appid, self._create_session_basic)
 
-        if creds := self.load_creds(appid):
-            return creds
+    async def fetch_auth_model_advanced(self, appid: str) -> AuthModel:
+        return await self.tickets.get(appid, self._create_session_advanced)
 
-        async with self.session.post(
-                "https://public-ubiservices.ubi.com/v3/profiles/sessions",
-                headers={
-                    "Authorization": f"Basic {token}",
-                    "Ubi-AppId": appid,
-                    "User-Agent": "UbiServices_SDK_2020.Release.58_PC64_ansi_static",
-                    "Content-Type": "application/json"
-                },
-                json={"rememberMe": True}
-        ) as resp:
-            data = await resp.json()
-            model = AuthModel(
-                ticket=data["ticket"],
-                session_id=data["sessionId"],
-                user_id=data["userId"],
-                expiration=data["expiration"],
-                appid=appid,
-                xplay_spaceid="0d2ae42d-4c27-4cb7-af6c-2099062302bb"
-            )
-            self.save_creds(model)
-            return model
+    async def _create_session_basic(self, appid: str) -> AuthModel:
+        token = self.get_basic_token()
 
-    async def fetch_auth_model_advanced(self, appid: str) -> AuthModel:
-        if creds := self.load_creds(appid):
-            return creds
+        data = await self._request_json(
+            "POST",
+            "https://public-ubiservices.ubi.com/v3/profiles/sessions",
+            headers={
+                "Authorization": f"Basic {token}",
+                "Ubi-AppId": appid,
+                "User-Agent": "UbiServices_SDK_2020.Release.58_PC64_ansi_static",
+                "Content-Type": "application/json"
+            },
+            json={"rememberMe": True},
+            endpoint="sessions"
+        )
+        model = AuthModel(
+            ticket=data["ticket"],
+            session_id=data["sessionId"],
+            user_id=data["userId"],
+            expiration=data["expiration"],
+            appid=appid,
+            xplay_spaceid="0d2ae42d-4c27-4cb7-af6c-2099062302bb"
+        )
+        return model
 
+    async def _create_session_advanced(self, appid: str) -> AuthModel:
         basic_auth = await self.fetch_auth_model_basic(BASIC_APP_ID)
 
-        async with self.session.post(
-                "https://public-ubiservices.ubi.com/v3/profiles/sessions",
-                headers={
-                    "Authorization": f"Ubi_v1 t={basic_auth.ticket}",
-                    "Ubi-AppId": appid,
-                    "User-Agent": "UbiServices_SDK_2020.Release.58_PC64_ansi_static",
-                    "Content-Type": "application/json"
-                },
-                json={"rememberMe": True}
-        ) as resp:
-            data = await resp.json()
-            model = AuthModel(
-                ticket=data["ticket"],
-                session_id=data["sessionId"],
-                user_id=data["userId"],
-                expiration=data["expiration"],
-                appid=appid,
-                xplay_spaceid="0d2ae42d-4c27-4cb7-af6c-2099062302bb"
-            )
-            self.save_creds(model)
-            return model
+        data = await self._request_json(
+            "POST",
+            "https://public-ubiservices.ubi.com/v3/profiles/sessions",
+            headers={
+                "Authorization": f"Ubi_v1 t={basic_auth.ticket}",
+                "Ubi-AppId": appid,
+                "User-Agent": "UbiServices_SDK_2020.Release.58_PC64_ansi_static",
+                "Content-Type": "application/json"
+            },
+            json={"rememberMe": True},
+            endpoint="sessions"
+        )
+        model = AuthModel(
+            ticket=data["ticket"],
+            session_id=data["sessionId"],
+            user_id=data["userId"],
+            expiration=data["expiration"],
+            appid=appid,
+            xplay_spaceid="0d2ae42d-4c27-4cb7-af6c-2099062302bb"
+        )
+        return model
+
+    async def _request_json(self, method: str, url: str, headers: dict, endpoint: str, **kwargs) -> Any:
+        """
+        Send a request to Ubiservices and decode the JSON body.
+
+        The request goes through the limiter of its app id and the circuit breaker of its endpoint
+        family. Throttling, 5xx responses, timeouts and connection errors are retried up to
+        RETRY_MAX_ATTEMPTS times with jittered backoff, honoring Retry-After on 429/503, as long as
+        the whole request fits in REQUEST_DEADLINE_SECONDS.
+
+        :param endpoint: endpoint family the circuit breaker is keyed on
+        :raises CircuitOpenError: when the endpoint family keeps failing
+        :raises UbisoftRequestError: for error and non-JSON responses once retries are exhausted
+        :raises asyncio.TimeoutError: when no limiter slot frees up in time
+        """
+        breaker = self._breaker(endpoint)
+        limiter = self._limiter(headers.get("Ubi-AppId"))
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + REQUEST_DEADLINE_SECONDS
+
+        attempt = 0
+        while True:
+            breaker.before_request()
+            try:
+                data = await self._send(limiter, method, url, headers, deadline, **kwargs)
+            except UbisoftRequestError as e:
+                retryable = e.status is None or e.status in RETRYABLE_STATUSES
+                if retryable or isinstance(e, UbisoftResponseError):
+                    breaker.record_failure()
+                else:
+                    # A 4xx means Ubisoft is up, the request itself is wrong
+                    breaker.record_success()
+
+                attempt += 1
+                if not retryable or attempt >= RETRY_MAX_ATTEMPTS:
+                    raise
+
+                delay = e.retry_after if e.retry_after is not None else backoff_delay(attempt - 1)
+                if delay > RETRY_AFTER_MAX_SECONDS or loop.time() + delay >= deadline:
+                    raise
+
+                logger.warning(f"[{endpoint}] {e}, retry {attempt}/{RETRY_MAX_ATTEMPTS - 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Cancelled (section timeout, client gone) or queued too long, release a half open probe
+                breaker.record_abandoned()
+                raise
+
+            breaker.record_success()
+            return data
+
+    async def _send(self, limiter: AdaptiveLimiter, method: str, url: str, headers: dict, deadline: float, **kwargs) -> Any:
+        """
+        :param deadline: event loop time the attempt has to finish by, queueing for the limiter included
+        """
+        loop = asyncio.get_running_loop()
+        started_at = await limiter.acquire(timeout=max(deadline - loop.time(), 0))
+        status = None
+        timeout = aiohttp.ClientTimeout(
+            total=max(min(REQUEST_TIMEOUT_SECONDS, deadline - loop.time()), 0.1),
+            connect=REQUEST_CONNECT_TIMEOUT_SECONDS
+        )
+        try:
+            async with self.session.request(method, url, headers=headers, timeout=timeout, **kwargs) as resp:
+                status = resp.status
+                if resp.status >= 400:
+                    raise UbisoftRequestError(
+                        resp.status,
+                        resp.reason,
+                        await resp.text(),
+                        parse_retry_after(resp.headers.get("Retry-After")) if resp.status in (429, 503) else None
+                    )
+                body = await resp.read()
+                try:
+                    return orjson.loads(body)
+                except orjson.JSONDecodeError:
+                    raise UbisoftResponseError(resp.status, resp.reason, body.decode("utf-8", errors="replace"))
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            raise UbisoftRequestError(None, type(e).__name__, str(e)) from e
+        finally:
+            limiter.release(started_at, status)
+
+    def _breaker(self, endpoint: str) -> CircuitBreaker:
+        if endpoint not in self.breakers:
+            self.breakers[endpoint] = CircuitBreaker(endpoint)
+        return self.breakers[endpoint]
+
+    def _limiter(self, appid: Optional[str]) -> AdaptiveLimiter:
+        if appid not in self.limiters:
+            self.limiters[appid] = AdaptiveLimiter(appid or "unknown")
+        return self.limiters[appid]
+
+    def limiter_metrics(self) -> Dict[str, Dict[str, float]]:
+        return {limiter.name: limiter.metrics() for limiter in self.limiters.values()}
+
+    def breaker_states(self) -> Dict[str, str]:
+        return {endpoint: breaker.state for endpoint, breaker in self.breakers.items()}
+
+    @staticmethod
+    def _resolve_sections(
+            sections: Optional[Iterable[str]],
+            get_twitch: bool = True,
+            get_current_platform: bool = True
+    ) -> FrozenSet[str]:
+        if sections is None:
+            sections = PLAYER_SECTIONS - ({"twitch"} if not get_twitch else set()) - ({"current_platform_info"} if not get_current_platform else set())
+
+        sections = frozenset(sections)
+        if unknown := sections - PLAYER_SECTIONS:
+            raise ValueError(f"Unknown player sections: {sorted(unknown)}. Valid sections: {sorted(PLAYER_SECTIONS)}")
+
+        return sections
 
     async def get_player(self,
          name: Optional[str] = None,
          uid: Optional[str] = None,
          platform: Literal["uplay", "xbl", "psn"] = "uplay",
          get_twitch: bool = True,
-         get_current_platform: bool = True
+         get_current_platform: bool = True,
+         sections: Optional[Iterable[str]] = None,
+         on_profile_id: Optional[Callable[[str], None]] = None,
+         degraded: Optional[List[str]] = None
     ) -> Player:
+        """
+        Fetch a player by name or profile id.
+
+        Sections that are still cached are reused, only the missing or expired ones are requested.
+
+        :param sections: subset of PLAYER_SECTIONS to fetch, defaults to all of them. With an empty set
+            only the name / profile id resolution is done, sections that are not fetched are left empty
+        :param on_profile_id: called with the profile id as soon as it is known, before the sections are
+            fetched, so callers can start their own requests for it in parallel
+        :param degraded: collects the sections that failed (left empty) or were served stale
+        """
+        sections = self._resolve_sections(sections, get_twitch, get_current_platform)
+
+        names = {}
+        if name:
+            profile_id, display_name = await self.inflight.do(
+                ("name", platform, name.lower()),
+                lambda: self._resolve_name(name, platform)
+            )
+            if display_name:
+                names[profile_id] = display_name
+        elif uid:
+            profile_id = uid
+        else:
+            raise Exception("Please input a name or uid to search for a player.")
+
+        if on_profile_id:
+            on_profile_id(profile_id)
+
+        players = await self._load_players_shared([profile_id], platform, sections, names)
+        if profile_id not in players:
+            raise ValueError(f"No profile found for {name or uid} on {platform}.")
+
+        player, player_degraded = players[profile_id]
+        if degraded is not None:
+            degraded.extend(sorted(player_degraded))
+        return player
+
+    async def get_players(self,
+         uids: List[str],
+         platform: Literal["uplay", "xbl", "psn"] = "uplay",
+         get_twitch: bool = True,
+         get_current_platform: bool = True,
+         sections: Optional[Iterable[str]] = None
+    ) -> Dict[str, Player]:
+        """
+        Fetch many players at once, sharing the list based Ubiservices endpoints between them.
+
+        Profiles, stats, full profiles, applications and the twitch GraphQL query are requested for
+        every profile id missing the section in chunks (see the *_BATCH_SIZE constants), persona and
+        progress only exist per profile and are requested concurrently.
+
+        :param uids: profile ids to fetch
+        :param platform: platform the profile ids belong to
+        :param get_twitch: whether to look up linked twitch accounts
+        :param get_current_platform: whether to look up the last used platform
+        :param sections: subset of PLAYER_SECTIONS to fetch, defaults to all of them
+        :return: players keyed by profile id, profile ids that could not be resolved are left out
+        """
+        sections = self._resolve_sections(sections, get_twitch, get_current_platform)
+
+        uids = list(dict.fromkeys(uid for uid in uids if uid))
+        if not uids:
+            return {}
+
+        players = await self._load_players_shared(uids, platform, sections)
+        return {profile_id: player for profile_id, (player, _) in players.items()}
+
+    async def _resolve_name(self, name: str, platform: str) -> Tuple[str, Optional[str]]:
+        """
+        Look up the profile id of a name, through the name cache when possible.
+
+        :return: the profile id, and the name as spelled by Ubisoft when it had to be requested
+        """
+        if self.section_cache and (profile_id := await self.section_cache.get_profile_id(name, platform)):
+            return profile_id, None
 
-        # Build cache key
-        key = None
-        if self.redis:
-            if uid:
-                key_data = {
-                    "uid": uid,
-                }
-            elif name:
-                key_data = {
-                    "name": name,
-                }
-            key = "player:" + hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
-
-            # Try Redis cache
-            cached = self.redis.cache_for_key(key, lambda: None)
-            if cached:
-                print(f"Cache hit on {uid}")
-                return deserialize_player(cached)
-
-        # Not cached, make the full request
         auth = await self.fetch_auth_model_basic(BASIC_APP_ID)
         headers = {
             "Authorization": f"Ubi_v1 t={auth.ticket}",
@@ -176,100 +488,315 @@ class UbisoftClient:
             "User-Agent": "UbiServices_SDK_2020.Release.58_PC64_ansi_static",
         }
 
-        if name:
-            url = f"https://public-ubiservices.ubi.com/v3/profiles?nameOnPlatform={parse.quote(name)}&platformType={parse.quote(platform)}"
-        elif uid:
-            url = f"https://public-ubiservices.ubi.com/v3/users/{uid}/profiles?platformType={parse.quote(platform)}"
-        else:
-            raise Exception("Please input a name or uid to search for a player.")
+        url = f"https://public-ubiservices.ubi.com/v3/profiles?nameOnPlatform={parse.quote(name)}&platformType={parse.quote(platform)}"
+        data = await self._request_json("GET", url, headers=headers, endpoint="profiles")
+
+        profiles = data.get("profiles") if isinstance(data, dict) else None
+        if not profiles:
+            raise ValueError(f"No profile found for {name} on {platform}. Response: {data}")
+
+        profile_id = profiles[0].get("profileId")
+        if self.section_cache:
+            await self.section_cache.set_profile_id(name, platform, profile_id)
+
+        return profile_id, profiles[0].get("nameOnPlatform")
+
+    async def _load_players_shared(
+            self,
+            profile_ids: List[str],
+            platform: str,
+            sections: FrozenSet[str],
+            names: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Tuple[Player, FrozenSet[str]]]:
+        """
+        _load_players, but profile ids already being loaded with the same sections are waited on instead.
+
+        :return: players keyed by profile id, each with the sections that failed or were served stale
+        """
+        async def load(keys: List[tuple]) -> Dict[tuple, Tuple[Player, FrozenSet[str]]]:
+            degraded: Dict[str, Set[str]] = {}
+            players = await self._load_players([key[-1] for key in keys], platform, sections, names, degraded=degraded)
+            return {
+                key: (players[key[-1]], frozenset(degraded.get(key[-1], ())))
+                for key in keys if key[-1] in players
+            }
 
-        async with self.session.get(url, headers=headers) as resp:
-            data = await resp.json()
-            profile_id = data.get("profiles")[0].get("profileId")
-            linked_account_data = await self.get_linked_accounts(profile_id, get_twitch)
-            persona_data = await self.get_persona(profile_id)
-            playtime_data = await self.get_playtime(profile_id)
-            progress_data = await self.get_progress(profile_id)
-            ranked_profiles_data = await self.get_ranked_profiles(profile_id, platform)
-            current_platform_info = None
-            if get_current_platform:
-                current_platform_info = await self.get_current_platform_info(profile_id)
-
-            model = Player(
-                id=profile_id,
-                uid=profile_id,
-                profile_pic_url_146=f"https://ubisoft-avatars.akamaized.net/{profile_id}/default_146_146.png",
-                profile_pic_url_256=f"https://ubisoft-avatars.akamaized.net/{profile_id}/default_256_256.png",
-                profile_pic_url_500=f"https://ubisoft-avatars.akamaized.net/{profile_id}/default_tall.png",
-                profile_pic_url=f"https://ubisoft-avatars.akamaized.net/{profile_id}/default_256_256.png",
-                linked_accounts=linked_account_data,
-                name=data.get("profiles")[0].get("nameOnPlatform"),
-                persona=persona_data,
-                level=playtime_data.level,
-                xp=progress_data.xp,
-                total_xp=progress_data.total_xp,
-                xp_to_level_up=progress_data.xp_to_level_up,
-                total_time_played=playtime_data.total_time_played,
-                total_time_played_hours=playtime_data.total_time_played_hours,
-                pvp_time_played=playtime_data.pvp_time_played,
-                pve_time_played=playtime_data.pve_time_played,
-                standard_profile=ranked_profiles_data.standard_profile,
-                unranked_profile=ranked_profiles_data.unranked_profile,
-                ranked_profile=ranked_profiles_data.ranked_profile,
-                casual_profile=ranked_profiles_data.casual_profile,
-                warmup_profile=ranked_profiles_data.warmup_profile,
-                event_profile=ranked_profiles_data.event_profile,
-                current_platform_info=current_platform_info
+        results = await self.inflight.do_many([("player", platform, sections, profile_id) for profile_id in profile_ids], load)
+        return {key[-1]: player for key, player in results.items() if player is not None}
+
+    async def _load_players(
+            self,
+            profile_ids: List[str],
+            platform: str,
+            sections: FrozenSet[str],
+            names: Optional[Dict[str, str]] = None,
+            refresh: bool = False,
+            degraded: Optional[Dict[str, Set[str]]] = None
+    ) -> Dict[str, Player]:
+        """
+        Assemble players from their cached sections, fetching only the sections that are missing.
+
+        Stale sections are served as they are and refreshed in the background.
+
+        :param profile_ids: profile ids to load
+        :param platform: platform the profile ids belong to
+        :param sections: sections to fill in
+        :param names: names already known from resolving them, saves the profiles call
+        :param refresh: whether stale sections have to be fetched again, used by the background refresh
+        :param degraded: filled with the sections of each player that failed (left empty) or were served stale
+        :return: players keyed by profile id, profile ids that could not be resolved are left out
+        """
+        wanted = {"name"} | sections
+        found: Dict[str, Dict[str, Any]] = {profile_id: {} for profile_id in profile_ids}
+        fresh: Dict[str, Dict[str, Any]] = {profile_id: {} for profile_id in profile_ids}
+        held: Dict[str, str] = {}
+        stale: Dict[str, Set[str]] = {}
+        fetch_ids = profile_ids
+
+        if self.section_cache:
+            found, stale = await self.section_cache.get_sections(profile_ids, wanted, platform)
+            if refresh:
+                for profile_id, stale_sections in stale.items():
+                    for section in stale_sections:
+                        del found[profile_id][section]
+                stale = {}
+            elif stale:
+                self._refresh_in_background(stale, platform)
+
+            incomplete = [profile_id for profile_id in profile_ids if not wanted <= found[profile_id].keys()]
+            held, busy = await self.section_cache.claim(incomplete)
+            if busy and refresh:
+                # Another worker is already refreshing these players
+                fetch_ids = [profile_id for profile_id in profile_ids if profile_id not in busy]
+            elif busy:
+                # Another worker is fetching these players right now, use what it caches
+                await self.section_cache.wait_released(busy)
+                cached, cached_stale = await self.section_cache.get_sections(busy, wanted, platform)
+                found.update(cached)
+                for profile_id in busy:
+                    stale.pop(profile_id, None)
+                stale.update(cached_stale)
+
+        for profile_id, name in (names or {}).items():
+            if "name" not in found[profile_id]:
+                found[profile_id]["name"] = fresh[profile_id]["name"] = name
+
+        try:
+            await self._fetch_missing_sections(fetch_ids, platform, sections, found, fresh)
+            if self.section_cache:
+                await self.section_cache.set_sections({profile_id: values for profile_id, values in fresh.items() if values}, platform)
+        finally:
+            if held:
+                await self.section_cache.release(held)
+
+        players: Dict[str, Player] = {}
+        for profile_id in profile_ids:
+            player_sections = found[profile_id]
+            if "name" not in player_sections:
+                continue  # unknown profile id
+
+            if degraded is not None:
+                player_degraded = (sections - player_sections.keys()) | stale.get(profile_id, set())
+                if player_degraded:
+                    degraded[profile_id] = player_degraded
+
+            linked_accounts = list(player_sections.get("linked_accounts", []))
+            if player_sections.get("twitch"):
+                linked_accounts.append(player_sections["twitch"])
+
+            players[profile_id] = self._build_player(
+                profile_id=profile_id,
+                name=player_sections["name"],
+                linked_accounts=linked_accounts,
+                persona=player_sections.get("persona"),
+                playtime=player_sections.get("playtime"),
+                progress=player_sections.get("progress"),
+                ranked_profiles=player_sections.get("ranked_profiles"),
+                current_platform_info=player_sections.get("current_platform_info")
             )
 
-            if self.redis and key:
-                try:
-                    self.redis.redis.setex(key, 900, json.dumps(serialize(model)))
-                except Exception as e:
-                    print(e)
-                    pass  # silent fail on cache store
+        return players
+
+    def _refresh_in_background(self, stale: Dict[str, set], platform: str) -> None:
+        """
+        Start a task fetching the stale sections again, profile ids already being refreshed are skipped.
+        """
+        profile_ids = [profile_id for profile_id in stale if profile_id not in self._refreshing]
+        if not profile_ids:
+            return
+
+        sections = frozenset().union(*(stale[profile_id] for profile_id in profile_ids)) - {"name"}
+        task = asyncio.create_task(self._load_players(profile_ids, platform, sections, refresh=True))
+        for profile_id in profile_ids:
+            self._refreshing[profile_id] = task
+
+        def done(finished: asyncio.Task) -> None:
+            for profile_id in profile_ids:
+                if self._refreshing.get(profile_id) is finished:
+                    del self._refreshing[profile_id]
+            if not finished.cancelled() and finished.exception() is not None:
+                logger.warning(f"[player_cache] Background refresh of {len(profile_ids)} players failed: {finished.exception()}")
+
+        task.add_done_callback(done)
+
+    async def _fetch_missing_sections(
+            self,
+            profile_ids: List[str],
+            platform: str,
+            sections: FrozenSet[str],
+            found: Dict[str, Dict[str, Any]],
+            fresh: Dict[str, Dict[str, Any]]
+    ) -> None:
+        """
+        Request every section missing from found, adding the results to both found and fresh.
+
+        Profile resolution and the sections that only need a profile id go out in one fan-out.
+        Sections of profile ids that turn out not to exist are dropped, so they are never cached.
+        """
+        # The profiles endpoint gives both the name and the linked accounts, and tells us which ids exist
+        to_resolve = [
+            profile_id for profile_id in profile_ids
+            if "name" not in found[profile_id] or ("linked_accounts" in sections and "linked_accounts" not in found[profile_id])
+        ]
+
+        fetchers: Dict[str, Callable[[List[str]], Awaitable[Dict[str, Any]]]] = {
+            "twitch": self._get_twitch_infos,
+            "persona": self.get_personas,
+            "playtime": self.get_playtimes,
+            "progress": self.get_progresses,
+            "ranked_profiles": lambda ids: self.get_ranked_profiles_batch(ids, platform),
+            "current_platform_info": self.get_current_platform_infos,
+        }
+        pending = {
+            section: ids for section in fetchers if section in sections
+            if (ids := [profile_id for profile_id in profile_ids if section not in found[profile_id]])
+        }
 
-            return model
+        # Every section only depends on the profile id, so fetch the missing ones all at once
+        profiles_by_user, *results = await asyncio.gather(
+            self.get_profiles_batch(to_resolve) if to_resolve else asyncio.sleep(0, {}),
+            *(
+                self._fetch_section(section, ids[0] if len(ids) == 1 else f"{len(ids)} profiles", fetchers[section](ids))
+                for section, ids in pending.items()
+            )
+        )
 
-    @staticmethod
-    def serialize(obj):
-        if isinstance(obj, list):
-            return [serialize(item) for item in obj]
-        elif is_dataclass(obj):
-            return {k: serialize(v) for k, v in asdict(obj).items()}
-        return obj
+        for profile_id in to_resolve:
+            profiles = profiles_by_user.get(profile_id)
+            if not profiles:
+                continue
+
+            own_profile = next((profile for profile in profiles if profile.get("profileId") == profile_id), profiles[0])
+            fresh[profile_id]["name"] = own_profile.get("nameOnPlatform")
+            if "linked_accounts" in sections:
+                fresh[profile_id]["linked_accounts"] = self._parse_linked_accounts(profiles)
+            found[profile_id].update(fresh[profile_id])
+
+        for (section, ids), result in zip(pending.items(), results):
+            if result is None:
+                continue  # failed, left empty and not cached
+
+            for profile_id in ids:
+                if "name" not in found[profile_id]:
+                    continue  # unknown profile id
+                if profile_id in result:
+                    value = result[profile_id]
+                elif section in MISSING_SECTION_DEFAULTS:
+                    value = MISSING_SECTION_DEFAULTS[section]
+                else:
+                    continue
+                found[profile_id][section] = fresh[profile_id][section] = value
 
     @staticmethod
-    def deserialize_player(data: dict) -> Player:
+    def _build_player(
+            profile_id: str,
+            name: str,
+            linked_accounts: Optional[List[LinkedAccount]],
+            persona: Optional[Persona],
+            playtime: Optional[Playtime],
+            progress: Optional[Progress],
+            ranked_profiles: Optional[RankedProfiles],
+            current_platform_info: Optional[CurrentPlatformInfo]
+    ) -> Player:
+        playtime = playtime or EMPTY_PLAYTIME
+        progress = progress or EMPTY_PROGRESS
+        ranked_profiles = ranked_profiles or EMPTY_RANKED_PROFILES
+
         return Player(
-            id=data["id"],
-            uid=data["uid"],
-            profile_pic_url_146=data["profile_pic_url_146"],
-            profile_pic_url_256=data["profile_pic_url_256"],
-            profile_pic_url_500=data["profile_pic_url_500"],
-            profile_pic_url=data["profile_pic_url"],
-            linked_accounts=[LinkedAccount(**a) for a in data["linked_accounts"]],
-            name=data["name"],
-            persona=Persona(**data["persona"]) if data["persona"] else None,
-            level=data["level"],
-            xp=data["xp"],
-            total_xp=data["total_xp"],
-            xp_to_level_up=data["xp_to_level_up"],
-            total_time_played=data["total_time_played"],
-            total_time_played_hours=data["total_time_played_hours"],
-            pvp_time_played=data["pvp_time_played"],
-            pve_time_played=data["pve_time_played"],
-            standard_profile=FullProfile(**data["standard_profile"]) if data["standard_profile"] else None,
-            unranked_profile=FullProfile(**data["unranked_profile"]) if data["unranked_profile"] else None,
-            ranked_profile=FullProfile(**data["ranked_profile"]) if data["ranked_profile"] else None,
-            casual_profile=FullProfile(**data["casual_profile"]) if data["casual_profile"] else None,
-            warmup_profile=FullProfile(**data["warmup_profile"]) if data["warmup_profile"] else None,
-            event_profile=FullProfile(**data["event_profile"]) if data["event_profile"] else None,
-            current_platform_info=CurrentPlatformInfo(**data["current_platform_info"]) if data["current_platform_info"] else None,
+            id=profile_id,
+            uid=profile_id,
+            profile_pic_url_146=f"https://ubisoft-avatars.akamaized.net/{profile_id}/default_146_146.png",
+            profile_pic_url_256=f"https://ubisoft-avatars.akamaized.net/{profile_id}/default_256_256.png",
+            profile_pic_url_500=f"https://ubisoft-avatars.akamaized.net/{profile_id}/default_tall.png",
+            profile_pic_url=f"https://ubisoft-avatars.akamaized.net/{profile_id}/default_256_256.png",
+            linked_accounts=linked_accounts or [],
+            name=name,
+            persona=persona,
+            level=playtime.level,
+            xp=progress.xp,
+            total_xp=progress.total_xp,
+            xp_to_level_up=progress.xp_to_level_up,
+            total_time_played=playtime.total_time_played,
+            total_time_played_hours=playtime.total_time_played_hours,
+            pvp_time_played=playtime.pvp_time_played,
+            pve_time_played=playtime.pve_time_played,
+            standard_profile=ranked_profiles.standard_profile,
+            unranked_profile=ranked_profiles.unranked_profile,
+            ranked_profile=ranked_profiles.ranked_profile,
+            casual_profile=ranked_profiles.casual_profile,
+            warmup_profile=ranked_profiles.warmup_profile,
+            event_profile=ranked_profiles.event_profile,
+            current_platform_info=current_platform_info
         )
 
+    @staticmethod
+    async def _fetch_section(section: str, profile_id: str, coro: Optional[Awaitable]) -> Optional[Any]:
+        """
+        Await a single player section, isolating its failure from the rest of the player.
+
+        :param section: section name, used for logging
+        :param profile_id: profile(s) the section belongs to, used for logging
+        :param coro: coroutine fetching the section, or None when the section was not requested
+        :return: the section model, or None when it was skipped, failed or timed out
+        """
+        if coro is None:
+            return None
+
+        try:
+            result = await asyncio.wait_for(coro, timeout=SECTION_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning(f"[{section}] Timed out after {SECTION_TIMEOUT_SECONDS}s for {profile_id}")
+            return None
+        except Exception as e:
+            logger.error(f"[{section}] Failed to fetch for {profile_id}. Error: {e}")
+            return None
+
+        return result
 
     async def get_linked_accounts(self, profile_id: str, get_twitch=True) -> List[LinkedAccount]:
+        # The twitch lookup is independent of the profiles call, run both at once
+        if get_twitch:
+            profiles_by_user, twitch_info = await asyncio.gather(
+                self.get_profiles_batch([profile_id]),
+                self._fetch_section("twitch", profile_id, self._get_twitch_info(profile_id))
+            )
+        else:
+            profiles_by_user, twitch_info = await self.get_profiles_batch([profile_id]), None
+
+        linked_accounts = self._parse_linked_accounts(profiles_by_user.get(profile_id, []))
+
+        if twitch_info is not None:
+            linked_accounts.append(twitch_info)
+
+        return linked_accounts
+
+    async def get_profiles_batch(self, user_ids: List[str]) -> Dict[str, List[dict]]:
+        """
+        Fetch every platform profile of the given users.
+
+        :param user_ids: user ids (the uplay profile id) to look up
+        :return: raw profile payloads grouped by user id, unknown users are left out
+        """
         auth = await self.fetch_auth_model_basic(BASIC_APP_ID)
         headers = {
             "Authorization": f"Ubi_v1 t={auth.ticket}",
@@ -278,28 +805,32 @@ class UbisoftClient:
             "User-Agent": "UbiServices_SDK_2020.Release.58_PC64_ansi_static",
         }
 
-        url = f"https://public-ubiservices.ubi.com/v3/profiles?userId={profile_id}"
-        async with self.session.get(url, headers=headers) as resp:
-            data = await resp.json()
-
-            linked_accounts = []
-            if "profiles" in data:
-                for profile_data in data["profiles"]:
-                    linked_account = LinkedAccount(
-                        profile_id=profile_data.get("profileId", ""),
-                        user_id=profile_data.get("userId", ""),
-                        platform_type=profile_data.get("platformType", ""),
-                        id_on_platform=profile_data.get("idOnPlatform", ""),
-                        name_on_platform=profile_data.get("nameOnPlatform", "")
-                    )
-                    linked_accounts.append(linked_account)
+        async def fetch_chunk(chunk: List[str]) -> Dict[str, List[dict]]:
+            url = f"https://public-ubiservices.ubi.com/v3/profiles?userIds={','.join(chunk)}"
+            data = await self._request_json("GET", url, headers=headers, endpoint="profiles")
 
-            if get_twitch:
-                twitch_info = await self._get_twitch_info(profile_id)
-                if twitch_info is not None:
-                    linked_accounts.append(twitch_info)
+            profiles_by_user = {}
+            for profile_data in data.get("profiles", []):
+                profiles_by_user.setdefault(profile_data.get("userId", ""), []).append(profile_data)
+
+            return profiles_by_user
+
+        return await self._gather_chunks(user_ids, PROFILES_BATCH_SIZE, fetch_chunk)
+
+    @staticmethod
+    def _parse_linked_accounts(profiles: List[dict]) -> List[LinkedAccount]:
+        linked_accounts = []
+        for profile_data in profiles:
+            linked_account = LinkedAccount(
+                profile_id=profile_data.get("profileId", ""),
+                user_id=profile_data.get("userId", ""),
+                platform_type=profile_data.get("platformType", ""),
+                id_on_platform=profile_data.get("idOnPlatform", ""),
+                name_on_platform=profile_data.get("nameOnPlatform", "")
+            )
+            linked_accounts.append(linked_account)
 
-            return linked_accounts
+        return linked_accounts
 
     async def get_persona(self, profile_id: str) -> Persona:
         auth = await self.fetch_auth_model_basic(BASIC_APP_ID)
@@ -312,21 +843,31 @@ class UbisoftClient:
         }
 
         url = f"https://public-ubiservices.ubi.com/v1/profiles/{profile_id}/persona?spaceId={auth.xplay_spaceid}"
-        async with self.session.get(url, headers=headers) as resp:
-            data = await resp.json()
+        data = await self._request_json("GET", url, headers=headers, endpoint="persona")
 
-            obj_data = data.get('obj', {})
-            enabled = obj_data.get('Enabled', False) if obj_data else False
+        obj_data = data.get('obj', {})
+        enabled = obj_data.get('Enabled', False) if obj_data else False
 
-            persona = Persona(
-                tag=data.get('personaTag', ''),
-                enabled=enabled,
-                nickname=data.get('nickname', '')
-            )
+        persona = Persona(
+            tag=data.get('personaTag', ''),
+            enabled=enabled,
+            nickname=data.get('nickname', '')
+        )
 
-            return persona
+        return persona
+
+    async def get_personas(self, profile_ids: List[str]) -> Dict[str, Persona]:
+        # The persona endpoint only takes a single profile
+        return await self._gather_per_profile("persona", profile_ids, self.get_persona)
 
     async def get_playtime(self, profile_id: str) -> Playtime:
+        playtimes = await self.get_playtimes([profile_id])
+        if profile_id not in playtimes:
+            raise ValueError("No profile data found in playtime response")
+
+        return playtimes[profile_id]
+
+    async def get_playtimes(self, profile_ids: List[str]) -> Dict[str, Playtime]:
         auth = await self.fetch_auth_model_basic(BASIC_APP_ID)
 
         headers = {
@@ -336,41 +877,42 @@ class UbisoftClient:
             "User-Agent": "UbiServices_SDK_2020.Release.58_PC64_ansi_static",
         }
 
-        url = (
-            f"https://public-ubiservices.ubi.com/v1/profiles/stats?"
-            f"profileIds={profile_id}&"
-            f"spaceId={auth.xplay_spaceid}&"
-            f"statNames=PPvPTimePlayed,PPvETimePlayed,PTotalTimePlayed,PClearanceLevel"
-        )
-        async with self.session.get(url, headers=headers) as resp:
-            data = await resp.json()
+        async def fetch_chunk(chunk: List[str]) -> Dict[str, Playtime]:
+            url = (
+                f"https://public-ubiservices.ubi.com/v1/profiles/stats?"
+                f"profileIds={','.join(chunk)}&"
+                f"spaceId={auth.xplay_spaceid}&"
+                f"statNames=PPvPTimePlayed,PPvETimePlayed,PTotalTimePlayed,PClearanceLevel"
+            )
+            data = await self._request_json("GET", url, headers=headers, endpoint="stats")
 
             if not isinstance(data, dict):
                 raise ValueError(f"Failed to load playtime. Response: {data}")
 
-            profiles = data.get("profiles", [])
-            if not profiles:
-                raise ValueError("No profile data found in playtime response")
-
-            stats = profiles[0].get("stats", {})
-
-            level = int(stats.get("PClearanceLevel", {}).get("value", 0))
-            pvp_time_played = int(stats.get("PPvPTimePlayed", {}).get("value", 0))
-            pve_time_played = int(stats.get("PPvETimePlayed", {}).get("value", 0))
-            total_time_played = int(stats.get("PTotalTimePlayed", {}).get("value", 0))
-            total_time_played_hours = total_time_played // 3600 if total_time_played else 0
-
-            playtime = Playtime(
-                level=level,
-                pvp_time_played=pvp_time_played,
-                pve_time_played=pve_time_played,
-                total_time_played=total_time_played,
-                total_time_played_hours=total_time_played_hours
-            )
+            playtimes = {}
+            for profile in data.get("profiles", []):
+                stats = profile.get("stats", {})
 
-            return playtime
+                level = int(stats.get("PClearanceLevel", {}).get("value", 0))
+                pvp_time_played = int(stats.get("PPvPTimePlayed", {}).get("value", 0))
+                pve_time_played = int(stats.get("PPvETimePlayed", {}).get("value", 0))
+                total_time_played = int(stats.get("PTotalTimePlayed", {}).get("value", 0))
+                total_time_played_hours = total_time_played // 3600 if total_time_played else 0
 
-    async def get_progress(self, profile_id: str) -> Progress | dict:
+                playtime = Playtime(
+                    level=level,
+                    pvp_time_played=pvp_time_played,
+                    pve_time_played=pve_time_played,
+                    total_time_played=total_time_played,
+                    total_time_played_hours=total_time_played_hours
+                )
+                playtimes[self._response_profile_id(profile.get("profileId"), chunk)] = playtime
+
+            return playtimes
+
+        return await self._gather_chunks(profile_ids, STATS_BATCH_SIZE, fetch_chunk)
+
+    async def get_progress(self, profile_id: str) -> Progress:
         auth = await self.fetch_auth_model_basic(BASIC_APP_ID)
 
         headers = {
@@ -382,37 +924,34 @@ class UbisoftClient:
 
         url = f"https://public-ubiservices.ubi.com/v1/profiles/{profile_id}/global/ubiconnect/economy/api/metaprogression"
 
-        async with self.session.get(url, headers=headers) as resp:
-            try:
-                data = await resp.json()
+        data = await self._request_json("GET", url, headers=headers, endpoint="metaprogression")
 
-                if not isinstance(data, dict):
-                    raise ValueError(f"Failed to load progress. Response: {data}")
+        if not isinstance(data, dict):
+            raise ValueError(f"Failed to load progress. Response: {data}")
 
-                level = int(data.get("level", 0))
-                xp = int(data.get("xp", 0))
-                total_xp = get_total_xp(level, xp)
-                xp_to_level_up = get_xp_to_next_lvl(level) - xp
+        level = int(data.get("level", 0))
+        xp = int(data.get("xp", 0))
+        total_xp = get_total_xp(level, xp)
+        xp_to_level_up = get_xp_to_next_lvl(level) - xp
 
-                progress = Progress(
-                    level=level,
-                    xp=xp,
-                    total_xp=total_xp,
-                    xp_to_level_up=xp_to_level_up
-                )
+        progress = Progress(
+            level=level,
+            xp=xp,
+            total_xp=total_xp,
+            xp_to_level_up=xp_to_level_up
+        )
 
-                return progress
+        return progress
 
-            except aiohttp.ContentTypeError:
-                text = await resp.text()
-                return {
-                    "error": "Non-JSON response",
-                    "status": resp.status,
-                    "reason": resp.reason,
-                    "text": text
-                }
+    async def get_progresses(self, profile_ids: List[str]) -> Dict[str, Progress]:
+        # The metaprogression endpoint only takes a single profile
+        return await self._gather_per_profile("progress", profile_ids, self.get_progress)
 
-    async def get_ranked_profiles(self, profile_id: str, platform_group: str) -> RankedProfiles | dict:
+    async def get_ranked_profiles(self, profile_id: str, platform_group: str) -> RankedProfiles:
+        ranked_profiles = await self.get_ranked_profiles_batch([profile_id], platform_group)
+        return ranked_profiles.get(profile_id, EMPTY_RANKED_PROFILES)
+
+    async def get_ranked_profiles_batch(self, profile_ids: List[str], platform_group: str) -> Dict[str, RankedProfiles]:
         auth = await self.fetch_auth_model_advanced(ADVANCED_RANKED_APP_ID)
 
         platform_group_value = PLATFORM_GROUP_MAP.get(platform_group.lower(), platform_group.lower())
@@ -424,110 +963,92 @@ class UbisoftClient:
             "User-Agent": "UbiServices_SDK_2020.Release.58_PC64_ansi_static",
         }
 
-        url = (
-            f"https://public-ubiservices.ubi.com/v2/spaces/{auth.xplay_spaceid}/title/r6s/skill/full_profiles?"
-            f"profile_ids={profile_id}"
-            f"&platform_families={platform_group_value}"
-        )
-        async with self.session.get(url, headers=headers) as resp:
-            try:
-                data = await resp.json()
-
-                if not isinstance(data, dict):
-                    raise ValueError(f"Failed to load full profiles. Response: {data}")
+        async def fetch_chunk(chunk: List[str]) -> Dict[str, RankedProfiles]:
+            url = (
+                f"https://public-ubiservices.ubi.com/v2/spaces/{auth.xplay_spaceid}/title/r6s/skill/full_profiles?"
+                f"profile_ids={','.join(chunk)}"
+                f"&platform_families={platform_group_value}"
+            )
+            data = await self._request_json("GET", url, headers=headers, endpoint="full_profiles")
 
-                standard_profile = None
-                unranked_profile = None
-                ranked_profile = None
-                casual_profile = None
-                warmup_profile = None
-                event_profile = None
+            if not isinstance(data, dict):
+                raise ValueError(f"Failed to load full profiles. Response: {data}")
 
-                boards = data.get('platform_families_full_profiles', [])[0].get('board_ids_full_profiles', [])
+            boards_by_profile: Dict[str, Dict[str, FullProfile]] = {}
 
-                for board in boards:
-                    board_id = board.get('board_id')
-                    full_profiles = board.get('full_profiles', [])
+            boards = data.get('platform_families_full_profiles', [])[0].get('board_ids_full_profiles', [])
 
-                    if not full_profiles:
-                        continue
+            for board in boards:
+                board_id = board.get('board_id')
 
-                    profile_data = full_profiles[0]
+                for profile_data in board.get('full_profiles', []):
                     profile = profile_data.get("profile", {})
-                    season_stats = profile_data.get("season_statistics", {})
-                    match_outcomes = season_stats.get("match_outcomes", {})
-
-                    max_rank_id = profile.get("max_rank", 0)
-                    max_rank_points = profile.get("max_rank_points", 0)
-                    rank_id = profile.get("rank", 0)
-                    rank_points = profile.get("rank_points", 0)
-                    top_rank_position = profile.get("top_rank_position", 0)
-                    season_id = profile.get("season_id", 0)
-
-                    rank_constants = get_rank_constants(season_id)
-                    rank_name, min_mmr, max_mmr, _ = get_rank_from_mmr(rank_points, season_id)
-                    max_rank_name = rank_constants[max_rank_id].get("name", '') if max_rank_id < len(rank_constants) else ''
-                    season_code = season_id_to_code(season_id)
-
-                    kills = season_stats.get("kills", 0)
-                    deaths = season_stats.get("deaths", 0)
-                    abandons = match_outcomes.get("abandons", 0)
-                    losses = match_outcomes.get("losses", 0)
-                    wins = match_outcomes.get("wins", 0)
-
-                    full_profile = FullProfile(
-                        max_rank_id=max_rank_id,
-                        max_rank_points=max_rank_points,
-                        rank_id=rank_id,
-                        rank_points=rank_points,
-                        top_rank_position=top_rank_position,
-                        season_id=season_id,
-                        max_rank=max_rank_name,
-                        rank=rank_name,
-                        prev_rank_points=min_mmr,
-                        next_rank_points=max_mmr,
-                        season_code=season_code,
-                        kills=kills,
-                        deaths=deaths,
-                        abandons=abandons,
-                        losses=losses,
-                        wins=wins
-                    )
+                    profile_id = self._response_profile_id(profile.get("id"), chunk)
+                    # Only the first entry per board and profile is used
+                    boards_by_profile.setdefault(profile_id, {}).setdefault(board_id, self._parse_full_profile(profile_data))
 
-                    if board_id == 'standard':
-                        standard_profile = full_profile
-                    elif board_id == 'unranked':
-                        unranked_profile = full_profile
-                    elif board_id == 'ranked':
-                        ranked_profile = full_profile
-                    elif board_id == 'casual':
-                        casual_profile = full_profile
-                    elif board_id == 'warmup':
-                        warmup_profile = full_profile
-                    elif board_id == 'event':
-                        event_profile = full_profile
-
-                ranked_profiles = RankedProfiles(
-                    standard_profile=standard_profile,
-                    unranked_profile=unranked_profile,
-                    ranked_profile=ranked_profile,
-                    casual_profile=casual_profile,
-                    warmup_profile=warmup_profile,
-                    event_profile=event_profile
+            return {
+                profile_id: RankedProfiles(
+                    standard_profile=profile_boards.get('standard'),
+                    unranked_profile=profile_boards.get('unranked'),
+                    ranked_profile=profile_boards.get('ranked'),
+                    casual_profile=profile_boards.get('casual'),
+                    warmup_profile=profile_boards.get('warmup'),
+                    event_profile=profile_boards.get('event')
                 )
+                for profile_id, profile_boards in boards_by_profile.items()
+            }
 
-                return ranked_profiles
+        return await self._gather_chunks(profile_ids, FULL_PROFILES_BATCH_SIZE, fetch_chunk)
 
-            except aiohttp.ContentTypeError:
-                text = await resp.text()
-                return {
-                    "error": "Non-JSON response",
-                    "status": resp.status,
-                    "reason": resp.reason,
-                    "text": text
-                }
+    @staticmethod
+    def _parse_full_profile(profile_data: dict) -> FullProfile:
+        profile = profile_data.get("profile", {})
+        season_stats = profile_data.get("season_statistics", {})
+        match_outcomes = season_stats.get("match_outcomes", {})
+
+        max_rank_id = profile.get("max_rank", 0)
+        max_rank_points = profile.get("max_rank_points", 0)
+        rank_id = profile.get("rank", 0)
+        rank_points = profile.get("rank_points", 0)
+        top_rank_position = profile.get("top_rank_position", 0)
+        season_id = profile.get("season_id", 0)
+
+        rank_constants = get_rank_constants(season_id)
+        rank_name, min_mmr, max_mmr, _ = get_rank_from_mmr(rank_points, season_id)
+        max_rank_name = rank_constants[max_rank_id].get("name", '') if max_rank_id < len(rank_constants) else ''
+        season_code = season_id_to_code(season_id)
+
+        kills = season_stats.get("kills", 0)
+        deaths = season_stats.get("deaths", 0)
+        abandons = match_outcomes.get("abandons", 0)
+        losses = match_outcomes.get("losses", 0)
+        wins = match_outcomes.get("wins", 0)
+
+        return FullProfile(
+            max_rank_id=max_rank_id,
+            max_rank_points=max_rank_points,
+            rank_id=rank_id,
+            rank_points=rank_points,
+            top_rank_position=top_rank_position,
+            season_id=season_id,
+            max_rank=max_rank_name,
+            rank=rank_name,
+            prev_rank_points=min_mmr,
+            next_rank_points=max_mmr,
+            season_code=season_code,
+            kills=kills,
+            deaths=deaths,
+            abandons=abandons,
+            losses=losses,
+            wins=wins
+        )
 
     async def get_current_platform_info(self, uuid: str) -> CurrentPlatformInfo:
+        platform_infos = await self.get_current_platform_infos([uuid])
+        return platform_infos.get(uuid, CurrentPlatformInfo("Unknown"))
+
+    async def get_current_platform_infos(self, uuids: List[str]) -> Dict[str, CurrentPlatformInfo]:
         auth = await self.fetch_auth_model_basic(BASIC_APP_ID)
 
         def get_last_used_app_per_profile(applications):
@@ -539,15 +1060,11 @@ class UbisoftClient:
                     latest_apps[profile_id] = (app["applicationId"], session_date)
 
             return {
-                "platform": R6_PLATFORMS.get(app_id, "Unknown")
+                profile_id: CurrentPlatformInfo(R6_PLATFORMS.get(app_id, "Unknown"))
                 for profile_id, (app_id, _) in latest_apps.items()
             }
 
         app_ids = ",".join(R6_PLATFORMS.keys())
-        url = (
-            f"https://public-ubiservices.ubi.com/v3/profiles/applications"
-            f"?profileIds={','.join([uuid])}&applicationIds={app_ids}"
-        )
 
         headers = {
             "Authorization": f"Ubi_v1 t={auth.ticket}",
@@ -557,15 +1074,23 @@ class UbisoftClient:
             "Content-Type": "application/json; charset=UTF-8"
         }
 
-        async with self.session.get(url, headers=headers) as resp:
-            data = await resp.json()
-            apps = data.get("applications", [])
-            result = get_last_used_app_per_profile(apps)
-            return CurrentPlatformInfo(
-                result.get("platform", "Unknown"),
+        async def fetch_chunk(chunk: List[str]) -> Dict[str, CurrentPlatformInfo]:
+            url = (
+                f"https://public-ubiservices.ubi.com/v3/profiles/applications"
+                f"?profileIds={','.join(chunk)}&applicationIds={app_ids}"
             )
+            data = await self._request_json("GET", url, headers=headers, endpoint="applications")
+
+            apps = data.get("applications", [])
+            return get_last_used_app_per_profile(apps)
+
+        return await self._gather_chunks(uuids, APPLICATIONS_BATCH_SIZE, fetch_chunk)
 
     async def _get_twitch_info(self, uuid: str) -> Optional[LinkedAccount]:
+        twitch_infos = await self._get_twitch_infos([uuid])
+        return twitch_infos.get(uuid)
+
+    async def _get_twitch_infos(self, uuids: List[str]) -> Dict[str, LinkedAccount]:
         auth = await self.fetch_auth_model_basic(BASIC_APP_ID)
 
         url = "https://public-ubiservices.ubi.com/v1/profiles/me/uplay/graphql"
@@ -578,97 +1103,92 @@ class UbisoftClient:
             "Content-Type": "application/json; charset=UTF-8"
         }
 
-        payload = {
-            "operationName": "GetMultipleUserProfiles",
-            "variables": {
-                "userIds": [uuid]
-            },
-            "query": """query GetMultipleUserProfiles($userIds: [String!]!) {
-                users(userIds: $userIds) {
-                    ...ProfileFragment
-                }
+        async def fetch_chunk(chunk: List[str]) -> Dict[str, LinkedAccount]:
+            payload = {
+                "operationName": "GetMultipleUserProfiles",
+                "variables": {
+                    "userIds": chunk
+                },
+                "query": GET_MULTIPLE_USER_PROFILES_QUERY
             }
-            fragment ProfileFragment on User {
-                id
-                userId
-                avatarUrl
-                name
-                level
-                onlineStatus
-                games(filterBy: {isOwned: true}) { totalCount }
-                lastPlayedGame {
-                    node {
-                        id
-                        name
-                        bannerUrl: backgroundUrl
-                        platform {
-                            id
-                            applicationId
-                            name
-                            type
-                        }
-                    }
-                }
-                currentOnlineGame {
-                    node {
-                        id
-                        name
-                        bannerUrl: backgroundUrl
-                        platform {
-                            id
-                            applicationId
-                            name
-                            type
-                        }
-                    }
-                }
-                networks {
-                    edges {
-                        node {
-                            id
-                            publicCodeName
-                        }
-                        meta {
-                            id
-                            name
-                        }
-                    }
-                }
-            }"""
-        }
 
-        async with self.session.post(url, headers=headers, json=payload) as resp:
-            data = await resp.json()
+            data = await self._request_json("POST", url, headers=headers, json=payload, endpoint="graphql")
 
             if not data.get("data") or not data.get("data").get("users"):
-                return None
+                return {}
 
-            networks = data.get("data").get("users")[0].get("networks", {}).get("edges")
-            if networks is None:
-                return None
+            twitch_infos = {}
+            for user in data.get("data").get("users"):
+                uuid = self._response_profile_id(user.get("userId") or user.get("id"), chunk)
 
-            for edge in networks:
-                if edge.get("node", {}).get("publicCodeName") == "TWITCH":
-                    twitch_username = edge.get("meta", {}).get("name")
-                    twitch_id = edge.get("meta", {}).get("id")
-                    return LinkedAccount(
-                        profile_id=uuid,
-                        user_id=uuid,
-                        platform_type="twitch",
-                        id_on_platform=twitch_id,
-                        name_on_platform=twitch_username
-                    )
+                networks = (user.get("networks") or {}).get("edges")
+                if networks is None:
+                    continue
 
-            return None
+                for edge in networks:
+                    if edge.get("node", {}).get("publicCodeName") == "TWITCH":
+                        twitch_username = edge.get("meta", {}).get("name")
+                        twitch_id = edge.get("meta", {}).get("id")
+                        twitch_infos[uuid] = LinkedAccount(
+                            profile_id=uuid,
+                            user_id=uuid,
+                            platform_type="twitch",
+                            id_on_platform=twitch_id,
+                            name_on_platform=twitch_username
+                        )
+                        break
+
+            return twitch_infos
+
+        return await self._gather_chunks(uuids, GRAPHQL_USERS_BATCH_SIZE, fetch_chunk)
+
+    @staticmethod
+    async def _gather_chunks(ids: List[str], size: int, fetch_chunk: Callable[[List[str]], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Run a list based request once per chunk of ids, concurrently, and merge the per-id results.
+        """
+        results: Dict[str, Any] = {}
+        for chunk_result in await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunked(ids, size))):
+            results.update(chunk_result)
+
+        return results
+
+    @staticmethod
+    async def _gather_per_profile(section: str, profile_ids: List[str], fetch: Callable[[str], Awaitable[Any]]) -> Dict[str, Any]:
+        """
+        Run a single profile request for every profile concurrently, dropping the ones that fail.
+        """
+        responses = await asyncio.gather(*(fetch(profile_id) for profile_id in profile_ids), return_exceptions=True)
+
+        results: Dict[str, Any] = {}
+        for profile_id, response in zip(profile_ids, responses):
+            if isinstance(response, BaseException):
+                logger.error(f"[{section}] Failed to fetch for {profile_id}. Error: {response}")
+                continue
+            results[profile_id] = response
+
+        return results
+
+    @staticmethod
+    def _response_profile_id(profile_id: Optional[str], chunk: List[str]) -> Optional[str]:
+        # Single id requests can be attributed even when the response doesn't echo the id back
+        if not profile_id and len(chunk) == 1:
+            return chunk[0]
+        return profile_id
 
     async def close(self):
-        await self.session.close()
+        for task in set(self._refreshing.values()):
+            task.cancel()
+        await self.tickets.close()
+        if self.session is not None:
+            await self.session.close()
 
 async def main():
     # Examples
     ubisoft_email = os.getenv("UBISOFT_EMAIL")
     ubisoft_password = os.getenv("UBISOFT_PASSWORD")
     client = UbisoftClient(email=ubisoft_email, password=ubisoft_password, redis_client=None)
+    await client.initialize()
     profile_id = "adb38455-fb57-47cb-9c7b-720a4f19e834"
 
     player = await client.get_player(name="Ext", platform="uplay")
@@ -0,0 +1,119 @@
+from dataclasses import fields
+from operator import attrgetter
+from typing import Any, Callable, Dict, Optional, Tuple
+from wrapper.constants import PLAYER_CODEC_VERSION
+from wrapper.models import (
+    LinkedAccount,
+    Persona,
+    Playtime,
+    Progress,
+    FullProfile,
+    CurrentPlatformInfo,
+    RankedProfiles
+)
+import msgpack
+
+# Field getters per model class, built on first use
+_GETTERS: Dict[type, Callable[[Any], Tuple[Any, ...]]] = {}
+
+def _getter(cls: type) -> Callable[[Any], Tuple[Any, ...]]:
+    getter = _GETTERS.get(cls)
+    if getter is None:
+        names = [field.name for field in fields(cls)]
+        # attrgetter returns a bare value, not a tuple, for a single name
+        getter = attrgetter(*names) if len(names) > 1 else (lambda obj, name=names[0]: (getattr(obj, name),))
+        _GETTERS[cls] = getter
+    return getter
+
+def _pack_model(obj: Any) -> Tuple[Any, ...]:
+    # Called by msgpack for every dataclass, which is stored as an array of its fields in declaration order
+    return _getter(type(obj))(obj)
+
+def _model(cls: type) -> Callable[[Any], Any]:
+    return lambda data: cls(*data) if data is not None else None
+
+def _decode_ranked_profiles(data: list) -> RankedProfiles:
+    return RankedProfiles(*(FullProfile(*profile) if profile else None for profile in data))
+
+# Turns the unpacked field arrays of a section back into its model
+SECTION_DECODERS: Dict[str, Callable[[Any], Any]] = {
+    "name": lambda data: data,
+    "linked_accounts": lambda data: [LinkedAccount(*account) for account in data],
+    # None is a valid cached value, the profile has no linked twitch account
+    "twitch": _model(LinkedAccount),
+    "persona": _model(Persona),
+    "playtime": _model(Playtime),
+    "progress": _model(Progress),
+    "ranked_profiles": _decode_ranked_profiles,
+    "current_platform_info": _model(CurrentPlatformInfo),
+}
+
+def encode_section(value: Any, written_at: float) -> bytes:
+    """
+    Pack a player section as [PLAYER_CODEC_VERSION, written at, value].
+
+    Models are packed as positional arrays, field names are not stored, so a change to a model
+    needs a PLAYER_CODEC_VERSION bump.
+    """
+    return msgpack.packb((PLAYER_CODEC_VERSION, written_at, value), default=_pack_model)
+
+def decode_section(section: str, data: bytes) -> Optional[Tuple[Any, float]]:
+    """
+    :return: the section model and when it was written, None for entries of another codec version
+    :raises ValueError: data is not a readable entry (msgpack errors are ValueErrors)
+    """
+    version, written_at, value = msgpack.unpackb(data)
+    if version != PLAYER_CODEC_VERSION:
+        return None
+    return SECTION_DECODERS[section](value), written_at
+
+def main():
+    # Round trip check, encode/decode time and bytes per player
+    import time
+    import timeit
+
+    def full_profile(board: int) -> FullProfile:
+        return FullProfile(
+            max_rank_id=27, max_rank_points=3712, rank_id=24 + board, rank_points=3519, top_rank_position=0,
+            season_id=36, max_rank="Emerald 3", rank="Platinum 1", prev_rank_points=3400, next_rank_points=3500,
+            season_code="Y9S4", kills=1843, deaths=1602, abandons=3, losses=121, wins=133
+        )
+
+    sections = {
+        "name": "Spider.Player",
+        "linked_accounts": [
+            LinkedAccount(
+                profile_id="0f5b1c0e-5e7b-4b38-8d1c-6c4c1c3f4b2a", user_id="0f5b1c0e-5e7b-4b38-8d1c-6c4c1c3f4b2a",
+                platform_type=platform, id_on_platform=f"{platform}-76561198000000000", name_on_platform="spider_player"
+            )
+            for platform in ("uplay", "steam", "twitch", "psn", "xbl")
+        ],
+        "twitch": None,
+        "persona": Persona(tag="spider", enabled=True, nickname="Spider"),
+        "playtime": Playtime(level=243, pvp_time_played=3_120_000, pve_time_played=84_000,
+                             total_time_played=3_204_000, total_time_played_hours=890),
+        "progress": Progress(level=243, xp=12_345, total_xp=13_780_345, xp_to_level_up=100_155),
+        "ranked_profiles": RankedProfiles(*(full_profile(board) for board in range(6))),
+        "current_platform_info": CurrentPlatformInfo(platform="pc"),
+    }
+    now = time.time()
+
+    def encode_msgpack():
+        return {section: encode_section(model, now) for section, model in sections.items()}
+
+    msgpack_entries = encode_msgpack()
+
+    for section, model in sections.items():
+        assert decode_section(section, msgpack_entries[section]) == (model, now), section
+
+    def decode_msgpack():
+        return {section: decode_section(section, entry) for section, entry in msgpack_entries.items()}
+
+    runs = 2_000
+    encode_us = min(timeit.repeat(encode_msgpack, number=runs, repeat=3)) / runs * 1e6
+    decode_us = min(timeit.repeat(decode_msgpack, number=runs, repeat=3)) / runs * 1e6
+    size = sum(len(entry) for entry in msgpack_entries.values())
+    print(f"msgpack: {size} bytes per player, encode {encode_us:.1f}us, decode {decode_us:.1f}us")
+
+if __name__ == "__main__":
+    main()
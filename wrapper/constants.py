@@ -3,6 +3,98 @@ BASIC_APP_ID = '83564d31-7cd7-4bc0-a763-6524e78d1a7f'
 BASIC_RANKED_APP_ID = '4391c956-8943-48eb-8859-07b0778f47b9' # NOT USED (FROM KYO)
 ADVANCED_RANKED_APP_ID = 'e3d5ea9e-50bd-43b7-88bf-39794f4e3d40'
 
+# Session tickets are renewed in the background this long before they expire
+TICKET_RENEW_BEFORE_SECONDS = 300
+# Delay before retrying a failed background renewal while the current ticket is still valid
+TICKET_RENEW_RETRY_SECONDS = 30
+
+# Adaptive (AIMD) concurrency window for outbound Ubiservices requests, per app id
+LIMITER_INITIAL_LIMIT = 20
+LIMITER_MIN_LIMIT = 2
+LIMITER_MAX_LIMIT = 100
+LIMITER_BACKOFF_RATIO = 0.5  # applied on 429 / 503
+LIMITER_LATENCY_BACKOFF_RATIO = 0.9  # applied when latency exceeds LIMITER_LATENCY_TOLERANCE x the best latency
+LIMITER_LATENCY_TOLERANCE = 3.0
+LIMITER_QUEUE_TIMEOUT_SECONDS = 5
+
+# Keep-alive pool shared by all Ubiservices traffic (one host), sized for both limiters at their max window
+HTTP_CONNECTION_LIMIT = 2 * LIMITER_MAX_LIMIT
+HTTP_CONNECTION_LIMIT_PER_HOST = 2 * LIMITER_MAX_LIMIT
+HTTP_DNS_CACHE_SECONDS = 300
+HTTP_KEEPALIVE_SECONDS = 30
+
+# Per request timeouts, so a hanging Ubiservices call fails quickly instead of holding a worker
+REQUEST_TIMEOUT_SECONDS = 8
+REQUEST_CONNECT_TIMEOUT_SECONDS = 3
+
+# Retries for throttled, failing or timed out requests (attempts include the first try)
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+RETRY_MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY_SECONDS = 0.25
+RETRY_MAX_DELAY_SECONDS = 2
+RETRY_AFTER_MAX_SECONDS = 5  # a longer Retry-After fails the request instead of waiting
+# Budget for one request including limiter queueing, retries and backoff. Kept below
+# SECTION_TIMEOUT_SECONDS so the request fails on its own and the breaker sees the outcome
+REQUEST_DEADLINE_SECONDS = 8
+
+# Circuit breaker per endpoint family (sessions, profiles, full_profiles, ...)
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_SECONDS = 30
+
+# Sections of a Player that can be fetched independently, see UbisoftClient.get_player(sections=...)
+PLAYER_SECTIONS = frozenset({
+    "linked_accounts",
+    "twitch",
+    "persona",
+    "playtime",
+    "progress",
+    "ranked_profiles",
+    "current_platform_info",
+})
+
+# How long each cached player section stays fresh, slow moving data lives longer than ranked stats
+PLAYER_SECTION_TTLS = {
+    "name": 6 * 60 * 60,
+    "linked_accounts": 6 * 60 * 60,
+    "persona": 6 * 60 * 60,
+    "twitch": 60 * 60,
+    "playtime": 30 * 60,
+    "progress": 30 * 60,
+    "ranked_profiles": 5 * 60,
+    "current_platform_info": 2 * 60,
+}
+# Stale sections are still served (and refreshed in the background) until this TTL, then Redis drops them
+PLAYER_SECTION_HARD_TTLS = {
+    "name": 24 * 60 * 60,
+    "linked_accounts": 24 * 60 * 60,
+    "persona": 24 * 60 * 60,
+    "twitch": 6 * 60 * 60,
+    "playtime": 6 * 60 * 60,
+    "progress": 6 * 60 * 60,
+    "ranked_profiles": 30 * 60,
+    "current_platform_info": 15 * 60,
+}
+PLAYER_NAME_TTL_SECONDS = 6 * 60 * 60  # name -> profile id mapping
+PLAYER_GENERATION_TTL_SECONDS = 15 * 60  # write counter guarding the formatted response, see PlayerSectionCache
+
+# Cross worker lock taken while a player is fetched, other workers wait for it and read the cache
+PLAYER_LOCK_TTL_MS = 10_000
+PLAYER_LOCK_WAIT_SECONDS = 3  # after that the waiting worker fetches the player itself
+PLAYER_LOCK_POLL_SECONDS = 0.05
+# Bump whenever a model in wrapper/models.py gains, loses or reorders fields, cached entries
+# written with another version are treated as expired
+PLAYER_CODEC_VERSION = 1
+
+# Upper bound for a single player section (persona, playtime, ...) before it is dropped from the player
+SECTION_TIMEOUT_SECONDS = 10
+
+# Max ids per request for the list based Ubiservices endpoints, larger lookups are split into chunks
+PROFILES_BATCH_SIZE = 50  # v3/profiles?userIds=
+STATS_BATCH_SIZE = 50  # v1/profiles/stats?profileIds=
+FULL_PROFILES_BATCH_SIZE = 50  # v2/.../skill/full_profiles?profile_ids=
+APPLICATIONS_BATCH_SIZE = 50  # v3/profiles/applications?profileIds=
+GRAPHQL_USERS_BATCH_SIZE = 50  # GetMultipleUserProfiles userIds
+
 PLATFORM_GROUP_MAP = {"uplay": "pc", "console": "console"}
 
 R6_PLATFORMS = {
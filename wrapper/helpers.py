@@ -1,49 +1,43 @@
-from typing import List, Dict, Optional, Union, Tuple
+from bisect import bisect_right
+from itertools import accumulate
+from typing import List, Dict, Iterator, NamedTuple, Optional, Sequence, Union, Tuple, TypeVar
 import re
 
+T = TypeVar("T")
+
+def chunked(items: Sequence[T], size: int) -> Iterator[List[T]]:
+    for i in range(0, len(items), size):
+        yield list(items[i:i + size])
+
 #############################################################
 ################## PROGRESS HELPER METHODS ##################
 #############################################################
+# XP needed to go from level n to n + 1, for levels 0 - 37. Above that it grows by 500 per level
+XP_TO_NEXT_LEVEL = (
+    500, 1_500, 3_500, 3_500, 4_000, 4_000, 4_500, 4_500, 4_500, 5_500,
+    5_500, 6_000, 6_000, 6_000, 6_500, 6_500, 6_500, 7_000, 7_000, 7_000,
+    7_500, 7_500, 7_500, 8_000, 8_000, 8_000, 8_500, 8_500, 8_500, 9_000,
+    9_000, 9_000, 9_500, 9_500, 9_500, 10_000, 10_000, 10_000
+)
+TABLE_MAX_LEVEL = len(XP_TO_NEXT_LEVEL) - 1
+
+# TOTAL_XP_AT_LEVEL[n] is the XP needed to reach level n from level 1, for levels 0 - 38
+TOTAL_XP_AT_LEVEL = (0, 0) + tuple(accumulate(XP_TO_NEXT_LEVEL[1:]))
+
 def get_xp_to_next_lvl(lvl: int) -> int:
-    if lvl > 37:
+    if lvl > TABLE_MAX_LEVEL:
         return (lvl - 18) * 500
-    if lvl == 0:
-        return 500
-    if lvl == 1:
-        return 1_500
-    if lvl in (2, 3):
-        return 3_500
-    if lvl in (4, 5):
-        return 4_000
-    if lvl in (6, 7, 8):
-        return 4_500
-    if lvl in (9, 10):
-        return 5_500
-    if lvl in (11, 12, 13):
-        return 6_000
-    if lvl in (14, 15, 16):
-        return 6_500
-    if lvl in (17, 18, 19):
-        return 7_000
-    if lvl in (20, 21, 22):
-        return 7_500
-    if lvl in (23, 24, 25):
-        return 8_000
-    if lvl in (26, 27, 28):
-        return 8_500
-    if lvl in (29, 30, 31):
-        return 9_000
-    if lvl in (32, 33, 34):
-        return 9_500
-    if lvl in (35, 36, 37):
-        return 10_000
+    if 0 <= lvl and lvl == int(lvl):
+        return XP_TO_NEXT_LEVEL[int(lvl)]
     raise ValueError(f"Level {lvl} is not a valid level.")
 
 def get_total_xp(lvl: int, current_xp: int) -> int:
-    total = 0
-    for level in range(1, lvl):
-        total += get_xp_to_next_lvl(level)
-    return total + current_xp
+    if lvl <= TABLE_MAX_LEVEL + 1:
+        return TOTAL_XP_AT_LEVEL[max(lvl, 0)] + current_xp
+
+    # Levels 38 to lvl - 1 cost (level - 18) * 500 each, an arithmetic series from 20 * 500 to (lvl - 19) * 500
+    high_levels = (lvl - 19) * (lvl - 18) // 2 - 19 * 20 // 2
+    return TOTAL_XP_AT_LEVEL[TABLE_MAX_LEVEL + 1] + high_levels * 500 + current_xp
 
 #############################################################
 ################ RANKED DATA HELPER METHODS #################
@@ -72,63 +66,92 @@ def season_code_to_id(season_code: str) -> int:
     return (int(code_split[0][1:]) - 1) * 4 + int(code_split[1])
 
 
-def get_rank_constants(season_number: int = -1) -> List[Dict[str, Union[str, int]]]:
+RANK_VERSIONS = (ranks_v1, ranks_v2, ranks_v3, ranks_v4, ranks_v5, ranks_v6)
+
+def get_rank_version(season_number: int = -1) -> int:
+    """
+    Index into RANK_VERSIONS of the rank table used in a season, the latest one for unknown seasons.
+    """
     if 1 <= season_number <= 3:
-        return ranks_v1
+        return 0
     if 4 == season_number:
-        return ranks_v2
+        return 1
     if 5 <= season_number <= 14:
-        return ranks_v3
+        return 2
     if 15 <= season_number <= 22:
-        return ranks_v4
+        return 3
     if 23 <= season_number <= 27:
-        return ranks_v5
-    if 28 <= season_number:
-        return ranks_v6
-    return ranks_v6
+        return 4
+    return 5
 
+def get_rank_constants(season_number: int = -1) -> List[Dict[str, Union[str, int]]]:
+    return RANK_VERSIONS[get_rank_version(season_number)]
+
+class CompiledRanks(NamedTuple):
+    min_mmrs: Tuple[int, ...]
+    max_mmrs: Tuple[int, ...]
+    names: Tuple[str, ...]
+    rank_ids: Tuple[int, ...]
+
+def compile_ranks(ranks: List[Dict[str, Union[str, int]]]) -> CompiledRanks:
+    # Sorted by min_mmr for bisection, the rank id stays the position in the original table
+    order = sorted(range(len(ranks)), key=lambda rank_id: int(ranks[rank_id]["min_mmr"]))
+    return CompiledRanks(
+        min_mmrs=tuple(int(ranks[rank_id]["min_mmr"]) for rank_id in order),
+        max_mmrs=tuple(int(ranks[rank_id]["max_mmr"]) for rank_id in order),
+        names=tuple(str(ranks[rank_id]["name"]) for rank_id in order),
+        rank_ids=tuple(order)
+    )
+
+# Compiled once per rank table version, see get_rank_version
+COMPILED_RANKS = tuple(compile_ranks(ranks) for ranks in RANK_VERSIONS)
 
 def get_rank_from_mmr(mmr: int | float, season: int = -1) -> Tuple[str, int, int, int]:
-    for rank_id, r in enumerate(get_rank_constants(season)):
-        if int(r["min_mmr"]) <= int(mmr) <= int(r["max_mmr"]):
-            return str(r["name"]), int(r["min_mmr"]), int(r["max_mmr"])+1, int(rank_id)
+    min_mmrs, max_mmrs, names, rank_ids = COMPILED_RANKS[get_rank_version(season)]
+    mmr = int(mmr)
+    # The last rank starting at or below mmr, mmr can still fall in a gap after it (v2 Gold 3 / Gold 4)
+    i = bisect_right(min_mmrs, mmr) - 1
+    if i >= 0 and mmr <= max_mmrs[i]:
+        return names[i], min_mmrs[i], max_mmrs[i] + 1, rank_ids[i]
     return "Unranked", 0, 0, 0
 
-from dataclasses import asdict, is_dataclass
-from typing import Any
-from wrapper.models import Player, LinkedAccount, FullProfile, Persona, CurrentPlatformInfo
-
-def serialize(obj: Any) -> Any:
-    if isinstance(obj, list):
-        return [serialize(item) for item in obj]
-    elif is_dataclass(obj):
-        return {k: serialize(v) for k, v in asdict(obj).items()}
-    return obj
-
-def deserialize_player(data: dict) -> Player:
-    return Player(
-        id=data["id"],
-        uid=data["uid"],
-        profile_pic_url_146=data["profile_pic_url_146"],
-        profile_pic_url_256=data["profile_pic_url_256"],
-        profile_pic_url_500=data["profile_pic_url_500"],
-        profile_pic_url=data["profile_pic_url"],
-        linked_accounts=[LinkedAccount(**a) for a in data["linked_accounts"]],
-        name=data["name"],
-        persona=Persona(**data["persona"]) if data["persona"] else None,
-        level=data["level"],
-        xp=data["xp"],
-        total_xp=data["total_xp"],
-        xp_to_level_up=data["xp_to_level_up"],
-        total_time_played=data["total_time_played"],
-        total_time_played_hours=data["total_time_played_hours"],
-        pvp_time_played=data["pvp_time_played"],
-        pve_time_played=data["pve_time_played"],
-        standard_profile=FullProfile(**data["standard_profile"]) if data["standard_profile"] else None,
-        unranked_profile=FullProfile(**data["unranked_profile"]) if data["unranked_profile"] else None,
-        ranked_profile=FullProfile(**data["ranked_profile"]) if data["ranked_profile"] else None,
-        casual_profile=FullProfile(**data["casual_profile"]) if data["casual_profile"] else None,
-        warmup_profile=FullProfile(**data["warmup_profile"]) if data["warmup_profile"] else None,
-        event_profile=FullProfile(**data["event_profile"]) if data["event_profile"] else None,
-        current_platform_info=CurrentPlatformInfo(**data["current_platform_info"]) if data["current_platform_info"] else None,
-    )
\ No newline at end of file
+def main():
+    # Equivalence check and microbenchmark against the previous linear scan / loop implementations
+    import random
+    import timeit
+
+    def linear_rank_from_mmr(mmr, season=-1):
+        for rank_id, r in enumerate(get_rank_constants(season)):
+            if int(r["min_mmr"]) <= int(mmr) <= int(r["max_mmr"]):
+                return str(r["name"]), int(r["min_mmr"]), int(r["max_mmr"])+1, int(rank_id)
+        return "Unranked", 0, 0, 0
+
+    def looped_total_xp(lvl, current_xp):
+        total = 0
+        for level in range(1, lvl):
+            total += get_xp_to_next_lvl(level)
+        return total + current_xp
+
+    seasons = [-1, 0] + list(range(1, 40))
+    mmrs = [-1.5, -1, -0.5, 0, 0.5, 1, 999.9, 2700.5, 2750, 999999, 1000000] + list(range(-10, 7000))
+    mismatches = [
+        (mmr, season) for season in seasons for mmr in mmrs
+        if get_rank_from_mmr(mmr, season) != linear_rank_from_mmr(mmr, season)
+    ]
+    mismatches += [(lvl, "xp") for lvl in range(-5, 2000) if get_total_xp(lvl, 123) != looped_total_xp(lvl, 123)]
+    print(f"{len(seasons) * len(mmrs) + 2005} cases, {len(mismatches)} mismatches")
+    assert not mismatches, mismatches[:10]
+
+    rng = random.Random(0)
+    sample_mmrs = [rng.uniform(0, 6000) for _ in range(1000)]
+    sample_levels = [rng.randint(1, 400) for _ in range(1000)]
+    for label, new, old, args in (
+        ("get_rank_from_mmr", get_rank_from_mmr, linear_rank_from_mmr, [(mmr, 30) for mmr in sample_mmrs]),
+        ("get_total_xp", get_total_xp, looped_total_xp, [(lvl, 0) for lvl in sample_levels]),
+    ):
+        old_seconds = min(timeit.repeat(lambda: [old(*a) for a in args], number=20, repeat=3))
+        new_seconds = min(timeit.repeat(lambda: [new(*a) for a in args], number=20, repeat=3))
+        print(f"{label}: {old_seconds / 20_000 * 1e6:.2f}us -> {new_seconds / 20_000 * 1e6:.2f}us per call")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+from collections import deque
+from typing import Deque, Dict, Optional
+from wrapper.constants import (
+    LIMITER_INITIAL_LIMIT,
+    LIMITER_MIN_LIMIT,
+    LIMITER_MAX_LIMIT,
+    LIMITER_BACKOFF_RATIO,
+    LIMITER_LATENCY_BACKOFF_RATIO,
+    LIMITER_LATENCY_TOLERANCE,
+    LIMITER_QUEUE_TIMEOUT_SECONDS
+)
+import asyncio
+import time
+
+class AdaptiveLimiter:
+    """
+    Caps the number of in-flight requests and adapts the cap AIMD-style.
+
+    Every successful response grows the limit by roughly one per window (additive increase),
+    a 429/503 shrinks it by LIMITER_BACKOFF_RATIO and a response much slower than the best
+    observed latency shrinks it by LIMITER_LATENCY_BACKOFF_RATIO (multiplicative decrease).
+    Decreases happen at most once per window so one burst of 429s doesn't collapse the limit.
+    Callers over the limit wait in a FIFO queue.
+    """
+    def __init__(
+            self,
+            name: str,
+            initial_limit: float = LIMITER_INITIAL_LIMIT,
+            min_limit: float = LIMITER_MIN_LIMIT,
+            max_limit: float = LIMITER_MAX_LIMIT,
+            queue_timeout: float = LIMITER_QUEUE_TIMEOUT_SECONDS
+    ):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = float(min_limit)
+        self.max_limit = float(max_limit)
+        self.queue_timeout = queue_timeout
+
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._min_latency: Optional[float] = None
+        self._latency_ewma: Optional[float] = None
+        self._last_decrease = 0.0
+
+        self.requests = 0
+        self.throttled = 0
+        self.queue_timeouts = 0
+        self.limit_decreases = 0
+
+    async def acquire(self, timeout: Optional[float] = None) -> float:
+        """
+        Wait for a free slot.
+
+        :param timeout: wait at most this long instead of queue_timeout, when it is shorter
+        :return: the monotonic start time to hand back to release
+        """
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return time.monotonic()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=min(self.queue_timeout, timeout) if timeout is not None else self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.queue_timeouts += 1
+            # Same as a cancellation, a slot granted as the timeout fired goes to the next waiter
+            self._return_granted_slot(waiter)
+            raise
+        except asyncio.CancelledError:
+            # A slot handed to us right before the cancellation must go to the next waiter
+            self._return_granted_slot(waiter)
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+        return time.monotonic()
+
+    def release(self, started_at: float, status: Optional[int] = None) -> None:
+        """
+        Free a slot and feed the outcome of the request into the limit.
+
+        :param started_at: value returned by acquire
+        :param status: HTTP status of the response, None when the request failed without one
+        """
+        self.in_flight -= 1
+        self.requests += 1
+        latency = time.monotonic() - started_at
+
+        if status in (429, 503):
+            self.throttled += 1
+            self._decrease(LIMITER_BACKOFF_RATIO)
+        elif status is not None:
+            self._record_latency(latency)
+            if latency > self._min_latency * LIMITER_LATENCY_TOLERANCE:
+                self._decrease(LIMITER_LATENCY_BACKOFF_RATIO)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+        self._wake_waiters()
+
+    def _record_latency(self, latency: float) -> None:
+        self._latency_ewma = latency if self._latency_ewma is None else 0.9 * self._latency_ewma + 0.1 * latency
+        # Let the baseline drift up slowly so a single lucky response doesn't pin it forever
+        if self._min_latency is None or latency < self._min_latency:
+            self._min_latency = latency
+        else:
+            self._min_latency = min(self._latency_ewma, self._min_latency * 1.01)
+
+    def _decrease(self, ratio: float) -> None:
+        now = time.monotonic()
+        # One window is roughly one round trip, but never shorter than 100ms
+        window = max(self._latency_ewma or 1.0, 0.1)
+        if now - self._last_decrease < window:
+            return
+
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * ratio)
+        self.limit_decreases += 1
+
+    def _return_granted_slot(self, waiter: asyncio.Future) -> None:
+        if waiter.done() and not waiter.cancelled():
+            self.in_flight -= 1
+            self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def metrics(self) -> Dict[str, float]:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "queue_timeouts": self.queue_timeouts,
+            "limit_decreases": self.limit_decreases,
+            "latency_ewma_ms": round(self._latency_ewma * 1000, 1) if self._latency_ewma is not None else None,
+            "min_latency_ms": round(self._min_latency * 1000, 1) if self._min_latency is not None else None,
+        }
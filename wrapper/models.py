@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import List, Optional
 
-@dataclass
+@dataclass(slots=True)
 class AuthModel:
     ticket: str
     session_id: str
@@ -10,7 +10,7 @@ class AuthModel:
     appid: str
     xplay_spaceid: str
 
-@dataclass
+@dataclass(slots=True)
 class LinkedAccount:
     profile_id: str
     user_id: str
@@ -18,13 +18,13 @@ class LinkedAccount:
     id_on_platform: str
     name_on_platform: str
 
-@dataclass
+@dataclass(slots=True)
 class Persona:
     tag: str
     enabled: bool
     nickname: str
 
-@dataclass
+@dataclass(slots=True)
 class Playtime:
     level: int
     pvp_time_played: int
@@ -32,14 +32,14 @@ class Playtime:
     total_time_played: int
     total_time_played_hours: int
 
-@dataclass
+@dataclass(slots=True)
 class Progress:
     level: int
     xp: int
     total_xp: int
     xp_to_level_up: int
 
-@dataclass
+@dataclass(slots=True)
 class FullProfile:
     max_rank_id: int
     max_rank_points: int
@@ -58,11 +58,11 @@ class FullProfile:
     losses: int
     wins: int
 
-@dataclass
+@dataclass(slots=True)
 class CurrentPlatformInfo:
     platform: str
 
-@dataclass
+@dataclass(slots=True)
 class RankedProfiles:
     standard_profile: Optional[FullProfile]
     unranked_profile: Optional[FullProfile]
@@ -72,7 +72,7 @@ class RankedProfiles:
     event_profile: Optional[FullProfile]
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     id: str
     uid: str
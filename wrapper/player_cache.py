@@ -0,0 +1,165 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from wrapper.constants import (
+    PLAYER_NAME_TTL_SECONDS,
+    PLAYER_GENERATION_TTL_SECONDS,
+    PLAYER_SECTION_TTLS,
+    PLAYER_SECTION_HARD_TTLS,
+    PLAYER_LOCK_TTL_MS,
+    PLAYER_LOCK_WAIT_SECONDS,
+    PLAYER_LOCK_POLL_SECONDS
+)
+from wrapper.codec import encode_section, decode_section
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+class PlayerSectionCache:
+    """
+    Caches every section of a player on its own, under player:<section>:<profile id>.
+
+    Each section has its own TTL (see PLAYER_SECTION_TTLS), so slow moving data like linked
+    accounts and personas outlives ranked stats, and a player can be assembled from whichever
+    sections are still cached, only the expired ones have to be fetched again.
+
+    Entries are msgpack encoded as [codec version, written at, value], see wrapper.codec. Past its
+    soft TTL (PLAYER_SECTION_TTLS) a section is stale but still served, the caller refreshes it in
+    the background. Redis only drops it after the hard TTL (PLAYER_SECTION_HARD_TTLS).
+    Name lookups are cached separately as a name -> profile id mapping.
+
+    Workers fetching the same player at the same time coordinate through a short lived lock
+    per profile id, see claim.
+    """
+    def __init__(
+            self,
+            redis_client,
+            ttls: Optional[Dict[str, int]] = None,
+            hard_ttls: Optional[Dict[str, int]] = None
+    ):
+        self.redis = redis_client
+        self.ttls = ttls or PLAYER_SECTION_TTLS
+        self.hard_ttls = hard_ttls or PLAYER_SECTION_HARD_TTLS
+
+    @staticmethod
+    def section_key(section: str, profile_id: str, platform: str = "uplay") -> str:
+        # Ranked stats differ per platform family, everything else is per profile only
+        if section == "ranked_profiles":
+            return f"player:{section}:{platform}:{profile_id}"
+        return f"player:{section}:{profile_id}"
+
+    @staticmethod
+    def name_key(name: str, platform: str) -> str:
+        # Ubisoft names are case insensitive
+        return f"player:name_to_id:{platform}:{name.lower()}"
+
+    @staticmethod
+    def response_key(profile_id: str) -> str:
+        # Formatted API response built from the sections, dropped whenever one of them is written.
+        # Bump the version when the response shape changes
+        return f"response:v2:{profile_id}"
+
+    @staticmethod
+    def generation_key(profile_id: str) -> str:
+        # Bumped whenever a section of the player is written, a formatted response is only cached
+        # if it did not move while the response was built (see RedisClient.set_if_unchanged)
+        return f"player:generation:{profile_id}"
+
+    @staticmethod
+    def lock_key(profile_id: str) -> str:
+        return f"player:lock:{profile_id}"
+
+    async def claim(self, profile_ids: List[str]) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Take the fetch lock of every profile id that no other worker is fetching right now.
+
+        :return: the locks we hold (to hand back to release), and the profile ids locked by someone else
+        """
+        held = await self.redis.try_lock_many([self.lock_key(profile_id) for profile_id in profile_ids], PLAYER_LOCK_TTL_MS)
+        busy = [profile_id for profile_id in profile_ids if self.lock_key(profile_id) not in held]
+        return held, busy
+
+    async def wait_released(self, profile_ids: List[str]) -> None:
+        """
+        Wait, up to PLAYER_LOCK_WAIT_SECONDS, for the workers holding these locks to finish.
+        """
+        still_locked = await self.redis.wait_unlocked(
+            [self.lock_key(profile_id) for profile_id in profile_ids],
+            PLAYER_LOCK_WAIT_SECONDS,
+            PLAYER_LOCK_POLL_SECONDS
+        )
+        if still_locked:
+            logger.info(f"[player_cache] Gave up waiting on {len(still_locked)} player locks, fetching them here")
+
+    async def release(self, held: Dict[str, str]) -> None:
+        await self.redis.unlock_many(held)
+
+    async def get_profile_id(self, name: str, platform: str) -> Optional[str]:
+        value, = await self.redis.get_many([self.name_key(name, platform)])
+        return value.decode("utf-8") if value else None
+
+    async def set_profile_id(self, name: str, platform: str, profile_id: str) -> None:
+        await self.redis.set_many([(self.name_key(name, platform), profile_id.encode("utf-8"), PLAYER_NAME_TTL_SECONDS)])
+
+    async def get_sections(
+            self,
+            profile_ids: List[str],
+            sections: Iterable[str],
+            platform: str = "uplay"
+    ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Set[str]]]:
+        """
+        Read the given sections of every profile with a single MGET.
+
+        :return: cached section models keyed by profile id then section, missing sections are left out,
+            and the sections past their soft TTL keyed by profile id
+        """
+        sections = list(sections)
+        lookups: List[Tuple[str, str]] = [(profile_id, section) for profile_id in profile_ids for section in sections]
+        values = await self.redis.get_many([self.section_key(section, profile_id, platform) for profile_id, section in lookups])
+
+        now = time.time()
+        cached: Dict[str, Dict[str, Any]] = {profile_id: {} for profile_id in profile_ids}
+        stale: Dict[str, Set[str]] = {}
+        for (profile_id, section), value in zip(lookups, values):
+            if value is None:
+                continue
+
+            try:
+                entry = decode_section(section, value)
+            except (ValueError, TypeError) as e:
+                # Entries written by an older layout are treated as expired
+                logger.warning(f"[player_cache] Dropping unreadable {section} entry for {profile_id}: {e}")
+                continue
+
+            if entry is None:
+                continue
+            cached[profile_id][section], written_at = entry
+
+            if now - written_at >= self.ttls[section]:
+                stale.setdefault(profile_id, set()).add(section)
+
+        return cached, stale
+
+    async def set_sections(self, sections_by_profile: Dict[str, Dict[str, Any]], platform: str = "uplay") -> None:
+        """
+        Write freshly fetched sections, each kept until the hard TTL of its section, in one pipeline.
+        The cached responses of these profiles are dropped and their generations bumped in the same pipeline.
+
+        :param sections_by_profile: section models keyed by profile id then section
+        """
+        now = time.time()
+        await self.redis.set_many(
+            [
+                (
+                    self.section_key(section, profile_id, platform),
+                    encode_section(model, now),
+                    self.hard_ttls[section]
+                )
+                for profile_id, sections in sections_by_profile.items()
+                for section, model in sections.items()
+            ],
+            delete=[self.response_key(profile_id) for profile_id, sections in sections_by_profile.items() if sections],
+            incr=[
+                (self.generation_key(profile_id), PLAYER_GENERATION_TTL_SECONDS)
+                for profile_id, sections in sections_by_profile.items() if sections
+            ]
+        )
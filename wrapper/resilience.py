@@ -0,0 +1,106 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from wrapper.constants import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_SECONDS,
+    RETRY_BASE_DELAY_SECONDS,
+    RETRY_MAX_DELAY_SECONDS
+)
+import random
+import time
+
+class CircuitOpenError(Exception):
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"Circuit for {endpoint} is open, retry in {retry_in:.1f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+class CircuitBreaker:
+    """
+    Fails fast for an endpoint family after repeated upstream failures.
+
+    After BREAKER_FAILURE_THRESHOLD consecutive failures the circuit opens and every call is
+    rejected for BREAKER_RESET_SECONDS. After that a single probe request is let through
+    (half open): a success closes the circuit again, a failure re-opens it.
+    """
+    def __init__(
+            self,
+            endpoint: str,
+            failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+            reset_seconds: float = BREAKER_RESET_SECONDS
+    ):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self._probing or time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def before_request(self) -> None:
+        """
+        :raises CircuitOpenError: when the circuit is open, or half open with a probe in flight
+        """
+        if self.opened_at is None:
+            return
+
+        retry_in = self.reset_seconds - (time.monotonic() - self.opened_at)
+        if retry_in > 0 or self._probing:
+            raise CircuitOpenError(self.endpoint, max(0.0, retry_in))
+
+        self._probing = True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+    def record_abandoned(self) -> None:
+        """
+        The request ended without an answer (cancelled, or gave up waiting for the limiter). That says
+        nothing about the endpoint, but a probe has to be released or the circuit never closes again.
+        """
+        self._probing = False
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Full jitter exponential backoff for the given (0-indexed) retry attempt.
+    """
+    return random.uniform(0, min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * (2 ** attempt)))
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header, given either in seconds or as an HTTP date.
+
+    :return: seconds to wait, or None when the header is missing or malformed
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
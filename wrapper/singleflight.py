@@ -0,0 +1,73 @@
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, TypeVar
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class SingleFlight:
+    """
+    Shares one in-flight call between concurrent callers asking for the same key.
+
+    The call runs in its own task, so a caller that gets cancelled doesn't cancel it for the
+    others still waiting. Keys are forgotten as soon as the call finishes, results are not cached.
+    """
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run call, or wait for the identical call already in flight.
+
+        :param key: identifies identical calls
+        :param call: coroutine function, only invoked when no call for key is in flight
+        """
+        future = self._calls.get(key)
+        if future is None:
+            future = self._track(key, asyncio.ensure_future(call()))
+
+        return await asyncio.shield(future)
+
+    async def do_many(
+            self,
+            keys: List[Hashable],
+            call: Callable[[List[Hashable]], Awaitable[Dict[Hashable, T]]]
+    ) -> Dict[Hashable, Optional[T]]:
+        """
+        Batched version of do: keys already in flight are waited on, the rest go out in one call.
+
+        :param keys: keys to resolve
+        :param call: coroutine function taking the keys not in flight and returning results keyed by them
+        :return: results keyed by key, None for keys the call left out
+        """
+        new_keys = [key for key in dict.fromkeys(keys) if key not in self._calls]
+        if new_keys:
+            batch = asyncio.ensure_future(call(new_keys))
+            for key in new_keys:
+                self._track(key, asyncio.ensure_future(self._pick(batch, key)))
+
+        # Grab the futures before awaiting anything, finished keys are dropped from _calls
+        futures = {key: self._calls[key] for key in keys}
+        results = await asyncio.gather(*(asyncio.shield(future) for future in futures.values()))
+        return dict(zip(futures.keys(), results))
+
+    @staticmethod
+    async def _pick(batch: Awaitable[Dict[Hashable, T]], key: Hashable) -> Optional[T]:
+        return (await batch).get(key)
+
+    def _track(self, key: Hashable, future: asyncio.Future) -> asyncio.Future:
+        self._calls[key] = future
+
+        def done(finished: asyncio.Future) -> None:
+            if self._calls.get(key) is finished:
+                del self._calls[key]
+            # Mark the exception as retrieved when every waiter was cancelled before it arrived
+            if not finished.cancelled() and finished.exception() is not None:
+                logger.debug(f"[singleflight] Call for {key} failed: {finished.exception()}")
+
+        future.add_done_callback(done)
+        return future
+
+    def __len__(self) -> int:
+        return len(self._calls)